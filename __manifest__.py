@@ -27,10 +27,11 @@
        Se abrirá una ventana con los almacenes disponibles:
        * Si hay 1 solo almacén: Se enviará automáticamente
        * Si hay varios almacenes: Seleccionar uno y hacer clic en "Confirmar y Enviar"
-       El sistema enviará la información a Place Vendor y cerrará la ventana automáticamente
+       El envío queda en cola (Place Vendor → Cola de envíos) y se procesa en segundo plano
 
     4. VERIFICAR ENVÍOS:
        Los envíos exitosos se registran en el chatter del pedido
+       Los envíos fallidos se reintentan automáticamente y pueden reintentarse desde la cola
        En caso de error, se mostrará un mensaje con los detalles
        Revisar los logs de Odoo para diagnóstico avanzado
 
@@ -56,7 +57,15 @@
         'views/sale_order_view.xml',
         'views/purchase_order_views.xml',
         'views/placevendor_config_views.xml',
-        'security/ir.model.access.csv'
+        'views/warehouse_list_views.xml',
+        'views/placevendor_outbox_views.xml',
+        'views/placevendor_mass_send_views.xml',
+        'views/stock_picking_views.xml',
+        'views/placevendor_endpoint_views.xml',
+        'views/placevendor_product_map_views.xml',
+        'views/placevendor_mapping_views.xml',
+        'security/ir.model.access.csv',
+        'data/ir_cron_data.xml'
     ],
     
     
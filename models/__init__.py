@@ -1,3 +1,14 @@
 from . import placevendor_config
+from . import placevendor_endpoint
+from . import placevendor_rate_limit
+from . import placevendor_product_map
+from . import placevendor_category_map
+from . import placevendor_company_map
+from . import warehouse_list
+from . import placevendor_outbox
+from . import placevendor_order_mixin
+from . import placevendor_mass_send
+from . import res_partner
+from . import stock_picking
 from . import sale_order
 from . import purchase_order
\ No newline at end of file
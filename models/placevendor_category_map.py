@@ -0,0 +1,66 @@
+# models/placevendor_category_map.py
+from odoo import models, fields, api, tools
+
+# Categoría de Place Vendor para las categorías sin mapear
+DEFAULT_REMOTE_CATEGORY_ID = 1
+
+
+class PlaceVendorCategoryMap(models.Model):
+    _name = 'placevendor.category.map'
+    _description = 'Categoría Odoo ↔ Place Vendor'
+    _rec_name = 'category_id'
+    _order = 'category_id'
+
+    category_id = fields.Many2one(
+        'product.category',
+        string='Categoría',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    remote_id = fields.Integer(
+        string='ID Place Vendor',
+        required=True
+    )
+
+    _sql_constraints = [
+        ('unique_category',
+         'UNIQUE(category_id)',
+         'La categoría ya está mapeada'),
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _get_mapping(self):
+        """{category_id: remote_id}, en caché del proceso"""
+        self.env.cr.execute("SELECT category_id, remote_id FROM placevendor_category_map")
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _get_remote_id(self, category):
+        """ID en Place Vendor de la categoría o de su antecesor mapeado más cercano"""
+        mapping = self._get_mapping()
+        if category and mapping:
+            # parent_path ('1/4/7/') está almacenado: no hace falta recorrer complete_name
+            for category_id in reversed(category.parent_path.split('/')[:-1]):
+                remote_id = mapping.get(int(category_id))
+                if remote_id:
+                    return remote_id
+        return DEFAULT_REMOTE_CATEGORY_ID
@@ -0,0 +1,373 @@
+# models/placevendor_client.py
+"""Cliente HTTP compartido por proceso para la API GraphQL de Place Vendor.
+
+Cada worker de Odoo mantiene un único cliente por ``laravel_url`` con
+conexiones keep-alive, de modo que las peticiones sucesivas reutilizan la
+conexión TCP/TLS en lugar de abrir una nueva por cada envío.
+"""
+import threading
+import hashlib
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_SEND_CONCURRENCY = 4
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class PlaceVendorClient:
+    """Sesión HTTP con pool de conexiones hacia un endpoint de Place Vendor"""
+
+    def __init__(self, url, pool_size=DEFAULT_POOL_SIZE):
+        self.url = url
+        self.pool_size = pool_size
+
+        # Los 429 no se reintentan aquí: los gestiona el limitador compartido
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['POST'])
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+        self.session.verify = False
+
+    def post(self, payload, token=None, timeout=30):
+        """Envía un documento GraphQL y devuelve la respuesta HTTP"""
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+        }
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+
+        return self.session.post(
+            self.url,
+            json=payload,
+            headers=headers,
+            timeout=timeout
+        )
+
+    def close(self):
+        """Cierra la sesión y las conexiones del pool"""
+        self.session.close()
+
+    def stats(self):
+        """Contadores de conexiones abiertas y reutilizadas por el pool"""
+        opened = requests_count = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            requests_count += pool.num_requests
+
+        return {
+            'opened': opened,
+            'reused': max(requests_count - opened, 0),
+            'requests': requests_count,
+        }
+
+
+def get_client(url, pool_size=DEFAULT_POOL_SIZE):
+    """Devuelve el cliente compartido del proceso para ``url``"""
+    with _clients_lock:
+        client = _clients.get(url)
+        if client is None or client.pool_size != pool_size:
+            _logger.info(f"Nuevo pool HTTP para Place Vendor: {url} (tamaño {pool_size})")
+            if client is not None:
+                # El pool anterior se cierra para no dejar sockets abiertos
+                client.close()
+            client = _clients[url] = PlaceVendorClient(url, pool_size)
+        return client
+
+
+def get_stats(url):
+    """Contadores del cliente de ``url`` sin crearlo si aún no existe"""
+    client = _clients.get(url)
+    if client is None:
+        return {'opened': 0, 'reused': 0, 'requests': 0}
+    return client.stats()
+
+
+def post_concurrently(client, payloads, token=None, concurrency=DEFAULT_SEND_CONCURRENCY, timeout=30,
+                      delays=None):
+    """Envía varios documentos en paralelo con un pool de hilos acotado.
+
+    Los hilos solo hacen HTTP (nunca tocan el ORM). ``delays`` son los
+    segundos, desde la llamada, que debe esperar cada documento antes de
+    salir (reservados en el limitador). Devuelve, en el mismo orden que
+    ``payloads``, una lista de (respuesta, error de conexión).
+    """
+    start = time.monotonic()
+
+    def send(item):
+        payload, delay = item
+        wait = delay - (time.monotonic() - start)
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            return client.post(payload, token=token, timeout=timeout), None
+        except requests.exceptions.RequestException as e:
+            return None, f'Error de conexión: {str(e)}'
+
+    if not payloads:
+        return []
+
+    items = zip(payloads, delays or [0] * len(payloads))
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(payloads)))) as executor:
+        return list(executor.map(send, items))
+
+
+def parse_retry_after(value):
+    """Segundos de la cabecera Retry-After (número o fecha HTTP), o None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# ============ CACHÉ LRU ============
+
+class LRUCache:
+    """Caché acotada en memoria, segura entre hilos; descarta lo menos usado"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key, build):
+        """Devuelve el valor de ``key``; si no está, lo calcula con ``build()``"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+
+        value = build()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# ============ DOCUMENTOS GRAPHQL CON ALIAS ============
+
+def build_aliased_mutation(operation, calls, prefix, selection='id doc_origin status date'):
+    """Construye un documento con un campo con alias por cada operación.
+
+    ``calls`` es la lista de (mutación, argumentos, valores), donde
+    ``argumentos`` son los (nombre, tipo GraphQL) de la mutación. Las
+    variables de cada operación se renombran con el alias como prefijo
+    (``d0_doc_origin``...). Devuelve (documento, variables, alias).
+    """
+    declarations = []
+    selections = []
+    variables = {}
+    aliases = []
+
+    for index, (mutation, arguments, values) in enumerate(calls):
+        alias = f'{prefix}{index}'
+        aliases.append(alias)
+
+        call_args = []
+        for name, graphql_type in arguments:
+            variable = f'{alias}_{name}'
+            declarations.append(f'${variable}: {graphql_type}')
+            call_args.append(f'{name}: ${variable}')
+            variables[variable] = values.get(name)
+
+        selections.append(f"{alias}: {mutation}({', '.join(call_args)}) {{ {selection} }}")
+
+    query = (
+        f"mutation {operation}({', '.join(declarations)}) {{\n    "
+        + '\n    '.join(selections)
+        + '\n}'
+    )
+    return query, variables, aliases
+
+
+def split_aliased_errors(result, aliases):
+    """Reparte los errores GraphQL por alias; los que no tienen ruta afectan a todos"""
+    errors = {alias: [] for alias in aliases}
+
+    for error in result.get('errors') or []:
+        message = format_graphql_error(error)
+        path = error.get('path') or []
+        alias = path[0] if path else None
+
+        if alias in errors:
+            errors[alias].append(message)
+        else:
+            for messages in errors.values():
+                messages.append(message)
+
+    return errors
+
+
+def format_graphql_error(error):
+    """Mensaje legible de un error GraphQL, con los detalles de validación"""
+    messages = [error.get('message', str(error))]
+
+    for field, field_errors in (error.get('validation') or {}).items():
+        messages.append(f"Validación {field}: {', '.join(field_errors)}")
+
+    return ' | '.join(messages)
+
+
+
+# ============ HUELLA DE ENVÍO ============
+
+# Claves que nunca forman parte de la huella de un documento
+FINGERPRINT_EXCLUDED_KEYS = frozenset(['email', 'password', 'token'])
+
+
+def payload_fingerprint(variables):
+    """Hash estable de las variables de un documento, sin credenciales.
+
+    Las claves se ordenan para que el mismo contenido dé siempre la misma
+    huella con independencia del orden en que se construyó el dict.
+    """
+    canonical = json.dumps(
+        {key: value for key, value in variables.items() if key not in FINGERPRINT_EXCLUDED_KEYS},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# ============ ACTUALIZACIONES INCREMENTALES ============
+
+# Producto y movimiento de Odoo de cada línea: se guardan en la instantánea
+# para identificar la línea entre envíos, pero nunca se envían a Place Vendor
+LINE_PRODUCT_KEY = 'odoo_product_id'
+LINE_MOVE_KEY = 'odoo_move_id'
+SNAPSHOT_ONLY_KEYS = frozenset([LINE_PRODUCT_KEY, LINE_MOVE_KEY])
+
+
+def _line_key(line, by_move=True):
+    """Identifica una línea de producto entre dos envíos.
+
+    Cada movimiento del picking es una línea, aunque un movimiento dividido
+    repita línea de pedido y producto. Sin movimiento se usa el producto de
+    Odoo, que no cambia aunque el producto se mapee en Place Vendor entre un
+    envío y otro; las instantáneas antiguas, sin él, caen en el ID remoto,
+    el SKU o el nombre.
+    """
+    if by_move and line.get(LINE_MOVE_KEY):
+        return f"move/{line[LINE_MOVE_KEY]}"
+    if line.get(LINE_PRODUCT_KEY):
+        return f"{line.get('model_id')}/{line[LINE_PRODUCT_KEY]}"
+    product = line.get('product') or {}
+    return f"{line.get('model_id')}/{line.get('product_id') or product.get('sku') or product.get('name')}"
+
+
+def _wire_line(line):
+    """Línea sin las claves que solo existen en la instantánea"""
+    return {key: value for key, value in line.items() if key not in SNAPSHOT_ONLY_KEYS}
+
+
+def wire_variables(variables):
+    """Variables de un documento tal como se envían a Place Vendor"""
+    if not variables.get('product_line'):
+        return variables
+    return dict(variables, product_line=[_wire_line(line) for line in variables['product_line']])
+
+
+def _line_ref(line):
+    product = line.get('product') or {}
+    ref = {'model_id': line.get('model_id'), 'sku': product.get('sku') or ''}
+    if line.get('product_id'):
+        ref['product_id'] = line['product_id']
+    return ref
+
+
+def _dict_delta(previous, current):
+    """Claves de ``current`` cuyo valor cambió; los dicts anidados se comparan por clave"""
+    delta = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if value == old:
+            continue
+        if isinstance(value, dict) and isinstance(old, dict):
+            delta[key] = _dict_delta(old, value)
+        else:
+            delta[key] = value
+    return delta
+
+
+def diff_document(previous, current):
+    """Cambios de un documento respecto al último enviado.
+
+    Devuelve solo los campos de cabecera que cambiaron y las líneas
+    añadidas, modificadas (con sus campos cambiados) y eliminadas; las
+    claves vacías se omiten para que el documento sea lo más pequeño posible.
+    """
+    # Misma representación que la instantánea guardada (JSON)
+    current = json.loads(json.dumps(current, default=str))
+
+    fields = {
+        key: value for key, value in current.items()
+        if key != 'product_line' and previous.get(key) != value
+    }
+
+    # Las instantáneas anteriores al movimiento en la línea se comparan sin él
+    previous_list = previous.get('product_line') or []
+    by_move = all(line.get(LINE_MOVE_KEY) for line in previous_list)
+    previous_lines = {_line_key(line, by_move): line for line in previous_list}
+    current_lines = {_line_key(line, by_move): line for line in current.get('product_line') or []}
+
+    added = [_wire_line(line) for key, line in current_lines.items() if key not in previous_lines]
+    removed = [_line_ref(line) for key, line in previous_lines.items() if key not in current_lines]
+    modified = [
+        dict(_line_ref(line), **_wire_line(_dict_delta(previous_lines[key], line)))
+        for key, line in current_lines.items()
+        if key in previous_lines and _wire_line(previous_lines[key]) != _wire_line(line)
+    ]
+
+    changes = {
+        'fields': fields,
+        'added_lines': added,
+        'modified_lines': modified,
+        'removed_lines': removed,
+    }
+    return {key: value for key, value in changes.items() if value}
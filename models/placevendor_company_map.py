@@ -0,0 +1,59 @@
+# models/placevendor_company_map.py
+from odoo import models, fields, api, tools
+
+# Compañía de Place Vendor para las compañías sin mapear
+DEFAULT_REMOTE_COMPANY_ID = 1
+
+
+class PlaceVendorCompanyMap(models.Model):
+    _name = 'placevendor.company.map'
+    _description = 'Compañía Odoo ↔ Place Vendor'
+    _rec_name = 'company_id'
+    _order = 'company_id'
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    remote_id = fields.Integer(
+        string='ID Place Vendor',
+        required=True
+    )
+
+    _sql_constraints = [
+        ('unique_company',
+         'UNIQUE(company_id)',
+         'La compañía ya está mapeada'),
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _get_mapping(self):
+        """{company_id: remote_id}, en caché del proceso"""
+        self.env.cr.execute("SELECT company_id, remote_id FROM placevendor_company_map")
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _get_remote_id(self, company):
+        """ID en Place Vendor de la compañía"""
+        return self._get_mapping().get(company.id, DEFAULT_REMOTE_COMPANY_ID)
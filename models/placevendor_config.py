@@ -1,12 +1,88 @@
 # models/placevendor_config.py
-from odoo import models, fields, api, _
-from odoo.exceptions import ValidationError
+from odoo import models, fields, api, tools
+from odoo.exceptions import ValidationError, UserError
 from datetime import timedelta
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 import logging
 
+from .placevendor_client import (
+    get_client, get_stats, post_concurrently, parse_retry_after, DEFAULT_POOL_SIZE, DEFAULT_SEND_CONCURRENCY,
+)
+from .placevendor_endpoint import UNAVAILABLE_MESSAGE
+from .placevendor_rate_limit import THROTTLED_MESSAGE
+
 _logger = logging.getLogger(__name__)
 
+# Vigencia del token devuelto por el login de Place Vendor
+TOKEN_LIFETIME = timedelta(hours=24)
+# Margen para renovar el token antes de que expire
+TOKEN_REFRESH_MARGIN = timedelta(minutes=10)
+# Antelación con que el cron renueva los tokens, muy por encima del margen
+# anterior para que los envíos de los usuarios nunca tengan que iniciar sesión
+TOKEN_REFRESH_AHEAD = timedelta(hours=2)
+
+# Paginación del catálogo de almacenes (sobrescribibles con parámetros del sistema)
+DEFAULT_WAREHOUSE_PAGE_SIZE = 50
+DEFAULT_WAREHOUSE_PAGE_CONCURRENCY = 4
+
+LOGIN_MUTATION = """
+    mutation Login($email: String!, $password: String!) {
+        login(email: $email, password: $password)
+    }
+"""
+
+WAREHOUSES_QUERY = """
+    mutation GetWarehousesByCompany(
+                $name: String, 
+                $first: Int, 
+                $page: Int) {
+        warehouses :getWarehousesByCompany(
+            name: $name
+            first: $first
+            page: $page
+        ) {
+            data {
+                id
+                name
+                address
+                description
+                company_id
+            }
+            paginatorInfo {
+                total
+                perPage
+                currentPage
+                lastPage
+                hasMorePages
+            }
+        }
+    }
+"""
+
+# Conexión resuelta de un usuario y compañía; inmutable para poder guardarla en
+# ormcache. Solo identifica la configuración: la URL y el usuario se leen del registro
+PlaceVendorConnection = namedtuple('PlaceVendorConnection', ['config_id', 'is_authenticated'])
+# Campos de los que depende la conexión en caché
+CONNECTION_FIELDS = frozenset([
+    'odoo_user_id', 'company_id', 'active', 'is_authenticated', 'is_service',
+])
+
+# Productos por página en la sincronización del catálogo
+DEFAULT_PRODUCT_PAGE_SIZE = 500
+
+PRODUCTS_MUTATION = """
+    mutation SyncProducts($products: [ProductInput!]!) {
+        products: syncProductsFromOdoo(products: $products) {
+            id
+            sku
+            product_idpadre
+        }
+    }
+"""
+
 class PlaceVendorConfig(models.Model):
     _name = 'placevendor.config'
     _description = 'Configuración de Autenticación Place Vendor'
@@ -45,6 +121,12 @@ class PlaceVendorConfig(models.Model):
         required=True
     )
     
+    is_service = fields.Boolean(
+        string='Credencial de servicio de la compañía',
+        default=False,
+        help='La usan todos los usuarios de la compañía que no tienen configuración propia'
+    )
+    
     # Estado
     is_authenticated = fields.Boolean(
         string='Autenticado',
@@ -65,6 +147,61 @@ class PlaceVendorConfig(models.Model):
     token = fields.Char(string='Token', readonly=True)
     token_expiration = fields.Datetime(string='Token expira', readonly=True)
     
+    # Catálogo local de almacenes
+    warehouse_ids = fields.One2many(
+        'warehouse.list',
+        'config_id',
+        string='Almacenes'
+    )
+    
+    warehouse_cache_ttl = fields.Integer(
+        string='Vigencia caché de almacenes (min)',
+        default=60,
+        help='Minutos que se reutiliza el catálogo local antes de volver a consultar Place Vendor'
+    )
+    
+    warehouses_synced_at = fields.Datetime(
+        string='Almacenes sincronizados',
+        readonly=True
+    )
+    
+    batch_pickings = fields.Boolean(
+        string='Agrupar pickings por orden',
+        default=True,
+        help='Envía todas las entregas/recepciones de una orden en una sola petición GraphQL'
+    )
+    
+    # Catálogo de productos
+    sync_products = fields.Boolean(
+        string='Sincronizar catálogo de productos',
+        default=False,
+        help='Envía periódicamente a Place Vendor los productos modificados'
+    )
+    
+    # Marca de agua: último producto enviado en orden (write_date, id)
+    products_synced_until = fields.Datetime(
+        string='Productos sincronizados hasta',
+        readonly=True
+    )
+    
+    products_synced_last_id = fields.Integer(readonly=True)
+    
+    products_sync_error = fields.Text(
+        string='Error de sincronización de productos',
+        readonly=True
+    )
+    
+    # Pool HTTP del proceso (diagnóstico)
+    http_connections_opened = fields.Integer(
+        string='Conexiones abiertas',
+        compute='_compute_http_stats'
+    )
+    
+    http_connections_reused = fields.Integer(
+        string='Conexiones reutilizadas',
+        compute='_compute_http_stats'
+    )
+    
     # Control
     active = fields.Boolean(string='Activo', default=True)
     
@@ -75,59 +212,72 @@ class PlaceVendorConfig(models.Model):
          'Ya existe una configuración para este usuario y compañía'),
     ]
     
+    @api.constrains('is_service', 'company_id', 'active')
+    def _check_single_service(self):
+        for record in self.filtered(lambda r: r.is_service and r.active):
+            if self.search_count([
+                ('is_service', '=', True),
+                ('company_id', '=', record.company_id.id),
+                ('id', '!=', record.id),
+            ]):
+                raise ValidationError(f'Ya existe una credencial de servicio activa para la compañía {record.company_id.name}')
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            # La credencial de servicio no pertenece a ningún usuario
+            if vals.get('is_service'):
+                vals['odoo_user_id'] = False
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+    
+    def write(self, vals):
+        # Al pasar a credencial de servicio deja de pertenecer a un usuario;
+        # al desmarcarla el propietario no se reasigna
+        if vals.get('is_service'):
+            vals = dict(vals, odoo_user_id=False)
+        result = super().write(vals)
+        # El token se renueva a menudo: solo se invalida si cambia la conexión
+        if CONNECTION_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        return result
+    
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+    
+    @api.model
+    @tools.ormcache('user_id', 'company_id')
+    def _get_connection(self, user_id, company_id):
+        """Conexión activa del usuario en la compañía, o None si no hay configuración.
+        
+        La configuración propia del usuario tiene prioridad; si no la tiene se
+        usa la credencial de servicio de la compañía.
+        """
+        config = self.sudo().search([
+            ('company_id', '=', company_id),
+            ('active', '=', True),
+            '|', ('odoo_user_id', '=', user_id), ('is_service', '=', True),
+        ], order='is_service, id', limit=1)
+        if not config:
+            return None
+        return PlaceVendorConnection(config.id, config.is_authenticated)
+    
+    @api.depends('laravel_url')
+    def _compute_http_stats(self):
+        for record in self:
+            stats = get_stats(record.laravel_url)
+            record.http_connections_opened = stats['opened']
+            record.http_connections_reused = stats['reused']
+    
     def test_authentication(self):
         """Probar autenticación con Place Vendor"""
         for record in self:
             try:
-                # GraphQL mutation para login
-                graphql_mutation = """
-                    mutation Login($email: String!, $password: String!) {
-                        login(email: $email, password: $password)
-                    }
-                """
-                
-                payload = {
-                    'query': graphql_mutation,
-                    'variables': {
-                        'email': record.laravel_user,
-                        'password': record.laravel_password
-                    }
-                }
-                
-                response = requests.post(
-                    record.laravel_url,
-                    json=payload,
-                    headers={'Content-Type': 'application/json'},
-                    timeout=10,
-                    verify=False
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    if 'errors' in data:
-                        error_msg = data['errors'][0]['message'] if data['errors'] else 'Error desconocido'
-                        record.write({
-                            'is_authenticated': False,
-                            'authentication_error': error_msg,
-                        })
-                        return self._show_notification('Error', error_msg, 'danger')
-                    
-                    if 'data' in data and data['data']['login']:
-                        token = data['data']['login']
-                        
-                        record.write({
-                            'is_authenticated': True,
-                            'last_authentication': fields.Datetime.now(),
-                            'authentication_error': False,
-                            'token': token,
-                            'token_expiration': fields.Datetime.now() + timedelta(hours=24)
-                        })
-                        
-                        return self._show_notification('Éxito', 'Autenticación exitosa', 'success')
-                        
-                else:
-                    raise Exception(f'Error HTTP {response.status_code}')
+                record._login()
+                return self._show_notification('Éxito', 'Autenticación exitosa', 'success')
                     
             except Exception as e:
                 error_msg = str(e)
@@ -137,6 +287,473 @@ class PlaceVendorConfig(models.Model):
                 })
                 return self._show_notification('Error', error_msg, 'danger')
     
+    # ============ SESIÓN CON TOKEN ============
+    
+    def _login(self):
+        """Inicia sesión en Place Vendor y guarda el token obtenido"""
+        self.ensure_one()
+        response = self._post(self._login_payload(), timeout=10)
+        return self._apply_login(response)
+    
+    def _login_payload(self):
+        self.ensure_one()
+        return {
+            'query': LOGIN_MUTATION,
+            'variables': {
+                'email': self.laravel_user,
+                'password': self.laravel_password
+            }
+        }
+    
+    def _apply_login(self, response):
+        """Guarda el token de la respuesta del login; UserError si no lo hay"""
+        self.ensure_one()
+        if response.status_code != 200:
+            raise UserError(f'Error HTTP {response.status_code}')
+        
+        data = response.json()
+        if data.get('errors'):
+            raise UserError(data['errors'][0].get('message') or 'Error desconocido')
+        
+        token = (data.get('data') or {}).get('login')
+        if not token:
+            raise UserError('No se recibió el token del login')
+        
+        now = fields.Datetime.now()
+        vals = {
+            'last_authentication': now,
+            'authentication_error': False,
+            'token': token,
+            'token_expiration': now + TOKEN_LIFETIME
+        }
+        if not self.is_authenticated:
+            vals['is_authenticated'] = True
+        self.write(vals)
+        _logger.info(f"Token de Place Vendor renovado para {self.laravel_user}")
+        return token
+    
+    def _get_token(self):
+        """Devuelve un token vigente, renovándolo si está por expirar.
+        
+        El cron ``_cron_refresh_tokens`` los renueva con antelación, así que
+        iniciar sesión aquí es solo el último recurso.
+        """
+        self.ensure_one()
+        
+        if (self.token and self.token_expiration
+                and self.token_expiration - TOKEN_REFRESH_MARGIN > fields.Datetime.now()):
+            return self.token
+        
+        return self._login()
+    
+    @api.model
+    def _cron_refresh_tokens(self):
+        """Renueva antes de que expiren los tokens de todas las configuraciones activas"""
+        limit = fields.Datetime.now() + TOKEN_REFRESH_AHEAD
+        configs = self.search([
+            ('active', '=', True),
+            ('is_authenticated', '=', True),
+            '|', ('token_expiration', '=', False), ('token_expiration', '<=', limit),
+        ])
+        if configs:
+            configs._refresh_tokens()
+    
+    def _refresh_tokens(self):
+        """Inicia sesión en paralelo con todas las configuraciones de ``self``.
+        
+        Los hilos solo hacen HTTP; los tokens se guardan después en este
+        hilo. Los fallos de red o del servidor conservan el token actual; un
+        rechazo del login marca la configuración como no autenticada.
+        Devuelve el número de tokens renovados.
+        """
+        endpoint = self.env['placevendor.endpoint']
+        limiter = self.env['placevendor.rate.limit']
+        concurrency = int(self.env['ir.config_parameter'].sudo().get_param(
+            'placevendor.login_concurrency', DEFAULT_SEND_CONCURRENCY))
+        
+        refreshed = 0
+        for url in set(self.mapped('laravel_url')):
+            if not endpoint._allow_request(url):
+                _logger.warning(f"Renovación de tokens pospuesta, {UNAVAILABLE_MESSAGE}: {url}")
+                continue
+            
+            # Cada credencial tiene su propio bucket en el limitador
+            configs, delays = self.browse(), []
+            for config in self.filtered(lambda c: c.laravel_url == url):
+                reserved = limiter._acquire(url, config.laravel_user)
+                if reserved:
+                    configs |= config
+                    delays.append(reserved[0])
+            if not configs:
+                continue
+            
+            results = post_concurrently(
+                configs[0]._get_http_client(),
+                [config._login_payload() for config in configs],
+                concurrency=concurrency,
+                timeout=10,
+                delays=delays
+            )
+            endpoint._record_results(url, results)
+            
+            for config, (response, error) in zip(configs, results):
+                if response is not None and response.status_code == 429:
+                    limiter._record_throttled(
+                        url, config.laravel_user, parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                    continue
+                if response is None or response.status_code >= 500:
+                    _logger.warning(f"No se pudo renovar el token de {config.laravel_user}: "
+                                    f"{error or f'Error HTTP {response.status_code}'}")
+                    continue
+                
+                limiter._record_success(url, config.laravel_user)
+                try:
+                    config._apply_login(response)
+                    refreshed += 1
+                except UserError as e:
+                    _logger.warning(f"Place Vendor rechazó el login de {config.laravel_user}: {str(e)}")
+                    config.write({
+                        'is_authenticated': False,
+                        'authentication_error': str(e)
+                    })
+        
+        return refreshed
+    
+    def _get_http_client(self):
+        """Cliente HTTP compartido del proceso para el endpoint de esta configuración"""
+        self.ensure_one()
+        pool_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'placevendor.http_pool_size', DEFAULT_POOL_SIZE))
+        return get_client(self.laravel_url, pool_size)
+    
+    def _graphql_request(self, query, variables=None, timeout=30):
+        """Ejecuta una operación GraphQL usando el token de sesión.
+        
+        Si Place Vendor rechaza el token (HTTP 401 o error de autenticación)
+        se vuelve a iniciar sesión una sola vez y se repite la petición.
+        """
+        self.ensure_one()
+        
+        payload = {
+            'query': query,
+            'variables': variables or {}
+        }
+        
+        response = self._post(payload, token=self._get_token(), timeout=timeout)
+        if self._is_auth_error(response):
+            _logger.info(f"Token rechazado por Place Vendor, iniciando sesión de nuevo ({self.laravel_user})")
+            response = self._post(payload, token=self._login(), timeout=timeout)
+        
+        return response
+    
+    def _post(self, payload, token=None, timeout=30):
+        """Envía un documento a Place Vendor pasando por el circuit breaker
+        y el limitador de peticiones.
+        
+        Con el circuito abierto falla al instante en lugar de esperar los
+        reintentos y el timeout de un endpoint caído. Un 429 se repite una
+        vez, cuando el limitador vuelve a dar paso.
+        """
+        self.ensure_one()
+        endpoint = self.env['placevendor.endpoint']
+        limiter = self.env['placevendor.rate.limit']
+        if not endpoint._allow_request(self.laravel_url):
+            raise UserError(UNAVAILABLE_MESSAGE)
+        
+        for _attempt in range(2):
+            delays = limiter._acquire(self.laravel_url, self.laravel_user)
+            if not delays:
+                raise UserError(THROTTLED_MESSAGE)
+            if delays[0]:
+                time.sleep(delays[0])
+            
+            try:
+                response = self._get_http_client().post(payload, token=token, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                endpoint._record_failure(self.laravel_url, str(e))
+                raise
+            
+            endpoint._record_response(self.laravel_url, response)
+            if response.status_code != 429:
+                limiter._record_success(self.laravel_url, self.laravel_user)
+                break
+            limiter._record_throttled(
+                self.laravel_url, self.laravel_user, parse_retry_after(response.headers.get('Retry-After'))
+            )
+        
+        return response
+    
+    @staticmethod
+    def _is_auth_error(response):
+        """Indica si la respuesta corresponde a un token inválido o expirado"""
+        if response.status_code == 401:
+            return True
+        if response.status_code != 200:
+            return False
+        
+        try:
+            result = response.json()
+        except ValueError:
+            return False
+        
+        for error in result.get('errors') or []:
+            message = (error.get('message') or '').lower()
+            category = (error.get('extensions') or {}).get('category')
+            if category == 'authentication' or 'unauthenticated' in message:
+                return True
+        return False
+    
+    # ============ CATÁLOGO DE ALMACENES ============
+    
+    def action_sync_warehouses(self):
+        """Sincronizar almacenes bajo demanda"""
+        for record in self:
+            if not record._sync_warehouses():
+                return self._show_notification('Error', 'No se pudieron sincronizar los almacenes', 'danger')
+        return self._show_notification('Éxito', 'Almacenes sincronizados', 'success')
+    
+    def _get_warehouses(self, force=False):
+        """Almacenes del catálogo local, refrescado si la caché expiró"""
+        self.ensure_one()
+        
+        ttl = timedelta(minutes=self.warehouse_cache_ttl or 0)
+        if force or not self.warehouses_synced_at or self.warehouses_synced_at + ttl <= fields.Datetime.now():
+            self._sync_warehouses()
+        
+        return self.warehouse_ids
+    
+    def _sync_warehouses(self):
+        """Actualiza el catálogo local con los almacenes de Place Vendor"""
+        self.ensure_one()
+        
+        Warehouse = self.env['warehouse.list'].with_context(active_test=False)
+        existing = {wh.external_id: wh for wh in Warehouse.search([('config_id', '=', self.id)])}
+        
+        seen = set()
+        try:
+            # Las páginas se procesan a medida que llegan
+            for warehouses_data in self._iter_warehouse_pages():
+                for wh in warehouses_data:
+                    external_id = int(wh['id'])
+                    seen.add(external_id)
+                    vals = {
+                        'name': wh.get('name') or f'Almacén {external_id}',
+                        'address': wh.get('address') or False,
+                        'description': wh.get('description') or False,
+                        'remote_company_id': int(wh.get('company_id') or 0),
+                        'active': True,
+                    }
+                    
+                    warehouse = existing.get(external_id)
+                    if not warehouse:
+                        existing[external_id] = Warehouse.create(dict(vals, external_id=external_id, config_id=self.id))
+                    elif any(warehouse[key] != value for key, value in vals.items()):
+                        warehouse.write(vals)
+        except Exception as e:
+            _logger.error(f"Error sincronizando almacenes de Place Vendor: {str(e)}")
+            return False
+        
+        # Los almacenes que ya no devuelve Place Vendor se archivan
+        removed = [wh for external_id, wh in existing.items() if external_id not in seen and wh.active]
+        if removed:
+            Warehouse.browse([wh.id for wh in removed]).write({'active': False})
+        
+        self.warehouses_synced_at = fields.Datetime.now()
+        _logger.info(f"Almacenes de Place Vendor sincronizados: {len(seen)} ({self.laravel_user})")
+        return True
+    
+    # ============ CATÁLOGO DE PRODUCTOS ============
+    
+    def action_sync_products(self):
+        """Lanza la sincronización del catálogo en segundo plano"""
+        self.write({'sync_products': True})
+        cron = self.env.ref('integracion_placevendor_odoo.ir_cron_placevendor_products', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        return self._show_notification('Éxito', 'Sincronización de productos en curso', 'success')
+    
+    def action_reset_products_watermark(self):
+        """La próxima sincronización vuelve a enviar todo el catálogo"""
+        self.write({
+            'products_synced_until': False,
+            'products_synced_last_id': 0,
+            'products_sync_error': False,
+        })
+    
+    @api.model
+    def _cron_sync_products(self, max_pages=50):
+        """Envía los productos modificados de cada configuración con el catálogo activo"""
+        for config in self.search([('sync_products', '=', True), ('is_authenticated', '=', True)]):
+            config._sync_products(max_pages=max_pages, commit=True)
+    
+    def _sync_products(self, max_pages=None, commit=False):
+        """Envía por páginas los productos modificados desde la marca de agua.
+        
+        La marca de agua avanza tras cada página aceptada; con ``commit`` se
+        confirma en el momento, así que tras una caída se sigue donde quedó.
+        Devuelve el número de productos enviados.
+        """
+        self.ensure_one()
+        config = self.with_company(self.company_id)
+        page_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'placevendor.product_page_size', DEFAULT_PRODUCT_PAGE_SIZE))
+        
+        sent = pages = 0
+        while max_pages is None or pages < max_pages:
+            products = config._next_product_page(page_size)
+            if not products:
+                break
+            
+            try:
+                config._push_product_page(products)
+            except Exception as e:
+                _logger.error(f"Error sincronizando productos con Place Vendor ({self.laravel_user}): {str(e)}")
+                self.products_sync_error = str(e)
+                if commit:
+                    self.env.cr.commit()
+                break
+            
+            last = products[-1]
+            self.write({
+                'products_synced_until': max(last.write_date, last.product_tmpl_id.write_date),
+                'products_synced_last_id': last.id,
+                'products_sync_error': False,
+            })
+            sent += len(products)
+            pages += 1
+            if commit:
+                self.env.cr.commit()
+        
+        if sent:
+            _logger.info(f"Productos enviados a Place Vendor: {sent} ({self.laravel_user})")
+        return sent
+    
+    def _next_product_page(self, limit):
+        """Siguiente página de productos modificados, en orden (fecha de cambio, id).
+        
+        La fecha de cambio es la mayor entre la variante y su plantilla, al
+        segundo (la precisión con que el ORM lee ``write_date``), para que la
+        marca de agua guardada avance siempre aunque muchos productos se
+        modifiquen en el mismo segundo.
+        """
+        self.ensure_one()
+        Product = self.env['product.product']
+        Product.flush_model(['write_date', 'product_tmpl_id'])
+        self.env['product.template'].flush_model(['write_date', 'company_id'])
+        
+        # Los archivados también se envían para que Place Vendor los desactive
+        self.env.cr.execute("""
+            SELECT pp.id
+              FROM product_product pp
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+             WHERE (pt.company_id IS NULL OR pt.company_id = %(company_id)s)
+               AND (%(since)s::timestamp IS NULL
+                    OR (date_trunc('second', GREATEST(pp.write_date, pt.write_date)), pp.id)
+                       > (%(since)s::timestamp, %(last_id)s))
+          ORDER BY date_trunc('second', GREATEST(pp.write_date, pt.write_date)), pp.id
+             LIMIT %(limit)s
+        """, {
+            'company_id': self.company_id.id,
+            'since': self.products_synced_until or None,
+            'last_id': self.products_synced_last_id,
+            'limit': limit,
+        })
+        return Product.with_context(active_test=False).browse([row[0] for row in self.env.cr.fetchall()])
+    
+    def _push_product_page(self, products):
+        """Mapea y envía una página de productos en una sola mutación y
+        guarda los IDs que asigna Place Vendor"""
+        self.ensure_one()
+        mapper = self.env['sale.order']
+        cache = mapper._placevendor_prefetch_products(products, {})
+        cache['remote_products'] = self.env['placevendor.product.map']._get_remote_ids(self.id, products.ids)
+        payload = [mapper._placevendor_map_product(product, cache, company=self.company_id) for product in products]
+        
+        response = self._graphql_request(PRODUCTS_MUTATION, {'products': payload}, timeout=60)
+        if response.status_code != 200:
+            raise UserError(f'Error HTTP: {response.status_code} - {response.text[:200]}')
+        
+        result = response.json()
+        if result.get('errors'):
+            raise UserError(f"Error GraphQL: {result['errors']}")
+        
+        remote_products = (result.get('data') or {}).get('products') or []
+        self.env['placevendor.product.map']._upsert(self, products, remote_products)
+        return remote_products
+    
+    def _iter_warehouse_pages(self, warehouse_name=None):
+        """Genera los almacenes de Place Vendor página a página.
+        
+        La primera página se pide sola para conocer ``lastPage``; el resto se
+        descargan en paralelo (hasta ``placevendor.warehouse_page_concurrency``)
+        y se entregan según van llegando.
+        """
+        self.ensure_one()
+        
+        params = self.env['ir.config_parameter'].sudo()
+        page_size = int(params.get_param('placevendor.warehouse_page_size', DEFAULT_WAREHOUSE_PAGE_SIZE))
+        concurrency = int(params.get_param('placevendor.warehouse_page_concurrency', DEFAULT_WAREHOUSE_PAGE_CONCURRENCY))
+        
+        variables = {
+            'first': page_size,
+            'page': 1,
+        }
+        if warehouse_name:
+            variables['name'] = warehouse_name
+        
+        # Primera página: aquí se renueva el token si hace falta
+        response = self._graphql_request(WAREHOUSES_QUERY, variables, timeout=30)
+        warehouses = _parse_warehouse_page(response)
+        yield warehouses.get('data') or []
+        
+        paginator = warehouses.get('paginatorInfo') or {}
+        last_page = paginator.get('lastPage') or 1
+        if not paginator.get('hasMorePages') or last_page <= 1:
+            return
+        
+        # Resto de páginas en paralelo: solo HTTP, sin ORM en los hilos
+        endpoint = self.env['placevendor.endpoint']
+        if not endpoint._allow_request(self.laravel_url):
+            raise UserError(UNAVAILABLE_MESSAGE)
+        
+        client = self._get_http_client()
+        token = self._get_token()
+        limiter = self.env['placevendor.rate.limit']
+        remaining = list(range(2, last_page + 1))
+        
+        # Las páginas salen al ritmo reservado en el limitador compartido; si
+        # solo se concede parte de los huecos se usan y se pide el resto después
+        while remaining:
+            delays = limiter._acquire(self.laravel_url, self.laravel_user, len(remaining))
+            if not delays:
+                raise UserError(THROTTLED_MESSAGE)
+            pages, remaining = remaining[:len(delays)], remaining[len(delays):]
+            
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pages)))) as executor:
+                futures = [
+                    executor.submit(_fetch_warehouse_page, client, token, dict(variables, page=page),
+                                    started + delay)
+                    for page, delay in zip(pages, delays)
+                ]
+                for future in as_completed(futures):
+                    try:
+                        page = future.result()
+                    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                        endpoint._record_failure(self.laravel_url, str(e))
+                        raise
+                    except requests.exceptions.HTTPError as e:
+                        if e.response is not None and e.response.status_code == 429:
+                            limiter._record_throttled(
+                                self.laravel_url, self.laravel_user,
+                                parse_retry_after(e.response.headers.get('Retry-After'))
+                            )
+                        raise
+                    yield page.get('data') or []
+            limiter._record_success(self.laravel_url, self.laravel_user, len(pages))
+        endpoint._record_success(self.laravel_url)
+    
     def _show_notification(self, title, message, type):
         """Mostrar notificación"""
         return {
@@ -153,9 +770,31 @@ class PlaceVendorConfig(models.Model):
     @api.model
     def get_config(self):
         """Obtener configuración activa para el usuario actual"""
-        return self.search([
-            ('odoo_user_id', '=', self.env.user.id),
-            ('company_id', '=', self.env.company.id),
-            ('active', '=', True),
-            ('is_authenticated', '=', True)
-        ], limit=1)
\ No newline at end of file
+        connection = self._get_connection(self.env.user.id, self.env.company.id)
+        if not connection or not connection.is_authenticated:
+            return self.browse()
+        return self.browse(connection.config_id)
+
+
+def _fetch_warehouse_page(client, token, variables, not_before=0):
+    """Descarga una página de almacenes (se ejecuta fuera del hilo del ORM)"""
+    wait = not_before - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+    response = client.post(
+        {'query': WAREHOUSES_QUERY, 'variables': variables},
+        token=token,
+        timeout=30
+    )
+    return _parse_warehouse_page(response)
+
+
+def _parse_warehouse_page(response):
+    """Extrae el bloque ``warehouses`` de la respuesta GraphQL"""
+    response.raise_for_status()
+    result = response.json()
+    
+    if 'errors' in result:
+        raise UserError(f"Error GraphQL: {result['errors']}")
+    
+    return (result.get('data') or {}).get('warehouses') or {}
@@ -0,0 +1,242 @@
+# models/placevendor_endpoint.py
+from odoo import models, fields, api
+import threading
+import time
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Fallos seguidos que abren el circuito
+DEFAULT_FAILURE_THRESHOLD = 5
+# Segundos que el circuito permanece abierto antes de la petición de prueba
+DEFAULT_COOLDOWN = 60
+# Segundos que un worker da por bueno un endpoint sano sin volver a consultarlo
+HEALTHY_CACHE_SECONDS = 5
+
+UNAVAILABLE_MESSAGE = 'Place Vendor no está disponible en este momento, se reintentará más tarde'
+
+# Valor de ``_allow_request`` para el worker que hace la petición de prueba
+PROBE_REQUEST = 'probe'
+
+# Endpoints que este proceso vio cerrados y sin fallos: {url: instante de la consulta}
+_healthy = {}
+_healthy_lock = threading.Lock()
+
+
+def _is_known_healthy(url):
+    with _healthy_lock:
+        checked = _healthy.get(url)
+    return checked is not None and time.monotonic() - checked < HEALTHY_CACHE_SECONDS
+
+
+def _set_healthy(url, healthy):
+    with _healthy_lock:
+        if healthy:
+            _healthy[url] = time.monotonic()
+        else:
+            _healthy.pop(url, None)
+
+
+class PlaceVendorEndpoint(models.Model):
+    """Circuit breaker por URL compartido entre todos los workers.
+
+    El estado vive en la base de datos y se actualiza siempre con un cursor
+    propio, de modo que los demás workers lo ven en cuanto cambia aunque la
+    transacción que detectó el fallo se revierta.
+    """
+    _name = 'placevendor.endpoint'
+    _description = 'Estado del endpoint de Place Vendor'
+    _rec_name = 'url'
+    _order = 'url'
+
+    url = fields.Char(
+        string='Endpoint',
+        required=True,
+        readonly=True
+    )
+
+    state = fields.Selection(
+        selection=[
+            ('closed', 'Disponible'),
+            ('open', 'Abierto'),
+            ('half_open', 'En prueba'),
+        ],
+        string='Circuito',
+        default='closed',
+        required=True,
+        readonly=True
+    )
+
+    failure_count = fields.Integer(string='Fallos seguidos', readonly=True)
+
+    retry_at = fields.Datetime(
+        string='Reintentar desde',
+        readonly=True,
+        help='Momento a partir del cual se permite la siguiente petición de prueba'
+    )
+
+    last_failure = fields.Datetime(string='Último fallo', readonly=True)
+
+    last_error = fields.Text(string='Último error', readonly=True)
+
+    _sql_constraints = [
+        ('unique_url',
+         'UNIQUE(url)',
+         'Ya existe el estado de este endpoint'),
+    ]
+
+    def action_close_circuit(self):
+        """Cierra el circuito manualmente"""
+        self.write({'state': 'closed', 'failure_count': 0, 'retry_at': False})
+        for endpoint in self:
+            _set_healthy(endpoint.url, False)
+
+    # ============ CIRCUIT BREAKER ============
+
+    @api.model
+    def _get_thresholds(self):
+        params = self.env['ir.config_parameter'].sudo()
+        return (
+            int(params.get_param('placevendor.circuit_failure_threshold', DEFAULT_FAILURE_THRESHOLD)),
+            int(params.get_param('placevendor.circuit_cooldown', DEFAULT_COOLDOWN)),
+        )
+
+    @api.model
+    def _allow_request(self, url):
+        """Indica si se puede llamar a ``url``.
+
+        Con el circuito abierto y la espera cumplida, solo el worker que gana
+        la actualización pasa a ``half_open`` y hace la petición de prueba; a
+        ese worker se le devuelve ``PROBE_REQUEST`` (también verdadero) para
+        que envíe una sola petición antes que las demás.
+        """
+        if _is_known_healthy(url):
+            return True
+
+        _threshold, cooldown = self._get_thresholds()
+        with self.env.registry.cursor() as cr:
+            cr.execute("SELECT state, failure_count FROM placevendor_endpoint WHERE url = %s", [url])
+            row = cr.fetchone()
+            if not row or row[0] == 'closed':
+                _set_healthy(url, not row or not row[1])
+                return True
+
+            # Si la prueba anterior no terminó (worker caído), otra puede tomar su lugar
+            cr.execute("""
+                UPDATE placevendor_endpoint
+                   SET state = 'half_open',
+                       retry_at = (now() at time zone 'UTC') + make_interval(secs => %s)
+                 WHERE url = %s
+                   AND state IN ('open', 'half_open')
+                   AND retry_at <= (now() at time zone 'UTC')
+             RETURNING id
+            """, [cooldown, url])
+            if cr.fetchone():
+                _logger.info(f"Circuito de Place Vendor en prueba: {url}")
+                return PROBE_REQUEST
+
+        return False
+
+    @api.model
+    def _retry_at(self, url):
+        """Momento en que se podrá volver a llamar a ``url``, o False si ya se puede"""
+        if _is_known_healthy(url):
+            return False
+
+        with self.env.registry.cursor() as cr:
+            cr.execute("""
+                SELECT retry_at
+                  FROM placevendor_endpoint
+                 WHERE url = %s
+                   AND state IN ('open', 'half_open')
+                   AND retry_at > (now() at time zone 'UTC')
+            """, [url])
+            row = cr.fetchone()
+        return row[0] if row else False
+
+    @api.model
+    def _record_success(self, url):
+        """Cierra el circuito tras una respuesta del servidor"""
+        if _is_known_healthy(url):
+            return
+
+        with self.env.registry.cursor() as cr:
+            cr.execute("""
+                UPDATE placevendor_endpoint
+                   SET state = 'closed',
+                       failure_count = 0,
+                       retry_at = NULL,
+                       write_date = (now() at time zone 'UTC')
+                 WHERE url = %s
+                   AND (state != 'closed' OR failure_count > 0)
+             RETURNING id
+            """, [url])
+            if cr.fetchone():
+                _logger.info(f"Circuito de Place Vendor cerrado: {url}")
+        _set_healthy(url, True)
+
+    @api.model
+    def _record_failure(self, url, error, count=1):
+        """Suma ``count`` fallos y abre el circuito al llegar al umbral.
+
+        Un fallo durante la petición de prueba lo vuelve a abrir enseguida.
+        """
+        _set_healthy(url, False)
+        threshold, cooldown = self._get_thresholds()
+        with self.env.registry.cursor() as cr:
+            cr.execute("""
+                INSERT INTO placevendor_endpoint AS ep
+                       (url, state, failure_count, last_error, last_failure, retry_at, create_date, write_date)
+                VALUES (%(url)s,
+                        CASE WHEN %(count)s >= %(threshold)s THEN 'open' ELSE 'closed' END,
+                        %(count)s,
+                        %(error)s,
+                        (now() at time zone 'UTC'),
+                        (now() at time zone 'UTC') + make_interval(secs => %(cooldown)s),
+                        (now() at time zone 'UTC'),
+                        (now() at time zone 'UTC'))
+           ON CONFLICT (url) DO UPDATE
+                   SET failure_count = ep.failure_count + %(count)s,
+                       last_error = EXCLUDED.last_error,
+                       last_failure = EXCLUDED.last_failure,
+                       write_date = EXCLUDED.write_date,
+                       state = CASE WHEN ep.state = 'half_open'
+                                      OR ep.failure_count + %(count)s >= %(threshold)s
+                                    THEN 'open' ELSE ep.state END,
+                       retry_at = CASE WHEN ep.state != 'open'
+                                        AND (ep.state = 'half_open'
+                                             OR ep.failure_count + %(count)s >= %(threshold)s)
+                                       THEN EXCLUDED.retry_at ELSE ep.retry_at END
+             RETURNING state
+            """, {
+                'url': url,
+                'count': count,
+                'error': error,
+                'threshold': threshold,
+                'cooldown': cooldown,
+            })
+            state = cr.fetchone()[0]
+
+        if state == 'open':
+            _logger.warning(f"Circuito de Place Vendor abierto para {url} ({cooldown} s): {error}")
+
+    @api.model
+    def _record_response(self, url, response):
+        """Registra el resultado de una respuesta HTTP; los 5xx cuentan como caída"""
+        if response.status_code >= 500:
+            self._record_failure(url, f'Error HTTP: {response.status_code}')
+        else:
+            self._record_success(url)
+
+    @api.model
+    def _record_results(self, url, results):
+        """Registra en bloque los (respuesta, error) de un envío concurrente"""
+        failures = [
+            error or f'Error HTTP: {response.status_code}'
+            for response, error in results
+            if response is None or response.status_code >= 500
+        ]
+        if failures:
+            self._record_failure(url, failures[-1], count=len(failures))
+        elif results:
+            self._record_success(url)
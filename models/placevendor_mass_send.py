@@ -0,0 +1,99 @@
+# models/placevendor_mass_send.py
+from odoo import models, fields, api
+from .placevendor_client import DEFAULT_SEND_CONCURRENCY
+
+
+class PlaceVendorMassSend(models.TransientModel):
+    _name = 'placevendor.mass.send'
+    _description = 'Envío masivo a Place Vendor'
+
+    res_model = fields.Char(
+        string='Modelo',
+        required=True,
+        readonly=True
+    )
+
+    order_count = fields.Integer(
+        string='Órdenes seleccionadas',
+        compute='_compute_order_count'
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        default=lambda self: self.env.company.id
+    )
+
+    # Configuración con la que se enviará (la propia del usuario o la de servicio)
+    config_id = fields.Many2one(
+        'placevendor.config',
+        default=lambda self: self.env['placevendor.config'].get_config()
+    )
+
+    warehouse_id = fields.Many2one(
+        'warehouse.list',
+        string='Almacén',
+        required=True,
+        domain="[('config_id', '=', config_id)]"
+    )
+
+    delivery_type = fields.Selection(
+        selection=[
+            ('DELIVERY', 'Delivery'),
+            ('PICKUP', 'Pickup'),
+        ],
+        string='Tipo de Entrega',
+        default='DELIVERY'
+    )
+
+    concurrency = fields.Integer(
+        string='Peticiones simultáneas',
+        default=lambda self: int(self.env['ir.config_parameter'].sudo().get_param(
+            'placevendor.send_concurrency', DEFAULT_SEND_CONCURRENCY)),
+        help='Número máximo de peticiones en paralelo a Place Vendor'
+    )
+
+    summary = fields.Text(string='Resultado', readonly=True)
+
+    @api.depends_context('active_ids')
+    def _compute_order_count(self):
+        for wizard in self:
+            wizard.order_count = len(self.env.context.get('active_ids') or [])
+
+    def action_send(self):
+        """Envía todas las órdenes seleccionadas y muestra el resumen"""
+        self.ensure_one()
+        orders = self.env[self.res_model].browse(self.env.context.get('active_ids') or [])
+
+        if self.res_model == 'sale.order':
+            orders.write({'delivery_type': self.delivery_type})
+
+        results = orders._placevendor_send_many(self.warehouse_id.external_id, max(1, self.concurrency))
+
+        lines = []
+        sent = unchanged = 0
+        for order in orders:
+            errors = results[order]
+            if errors is None:
+                unchanged += 1
+                lines.append(f"➖ {order.name}: sin cambios desde el último envío")
+            elif errors:
+                lines.append(f"❌ {order.name}: {' | '.join(errors)}")
+            else:
+                sent += 1
+                lines.append(f"✅ {order.name}")
+                order.message_post(body='Enviado a Place Vendor')
+
+        header = f"Enviadas {sent} de {len(orders)} órdenes"
+        if unchanged:
+            header += f" ({unchanged} sin cambios)"
+        self.summary = f"{header}\n\n" + '\n'.join(lines)
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Resultado del envío',
+            'res_model': self._name,
+            'view_mode': 'form',
+            'res_id': self.id,
+            'target': 'new',
+            'context': self.env.context,
+        }
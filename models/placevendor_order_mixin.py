@@ -0,0 +1,736 @@
+# models/placevendor_order_mixin.py
+from odoo import models, fields, api
+import json
+import logging
+
+from .placevendor_client import (
+    post_concurrently, build_aliased_mutation, split_aliased_errors, payload_fingerprint, diff_document, wire_variables,
+    parse_retry_after, LRUCache, DEFAULT_SEND_CONCURRENCY, LINE_PRODUCT_KEY, LINE_MOVE_KEY,
+)
+from .placevendor_endpoint import UNAVAILABLE_MESSAGE, PROBE_REQUEST
+from .placevendor_rate_limit import THROTTLED_MESSAGE
+
+_logger = logging.getLogger(__name__)
+
+# Contactos y direcciones ya preparados, compartidos por ventas y compras:
+# {(bd, tipo, partner, write_date): payload}
+CONTACT_CACHE_SIZE = 4096
+_contact_cache = LRUCache(CONTACT_CACHE_SIZE)
+
+
+class PlaceVendorOrderMixin(models.AbstractModel):
+    """Preparación de payloads común a pedidos de venta y de compra"""
+    _name = 'placevendor.order.mixin'
+    _description = 'Utilidades de envío a Place Vendor'
+
+    # Tipo de línea que se informa a Place Vendor en ``model_type``
+    _placevendor_line_type = None
+    # Nombre del documento remoto en los mensajes ('Entrega', 'Recepción')
+    _placevendor_document_label = None
+    # Argumentos ContactInput del documento cuyo ID remoto se guarda en el partner
+    _placevendor_contact_fields = ()
+    # Campo del producto que indica si se puede vender/comprar
+    _placevendor_product_ok_field = None
+    # Método que encola el envío al almacén elegido ('send_delivery_to_laravel', ...)
+    _placevendor_send_method = None
+    # XML ID del formulario de selección de almacén
+    _placevendor_warehouse_view = None
+    # (mutación, argumentos) con que se crea el documento y con que se actualiza
+    _placevendor_create_mutation = None
+    _placevendor_update_mutation = None
+    # Nombre de la operación GraphQL y prefijo de los alias de cada picking
+    _placevendor_operation_name = None
+    _placevendor_alias_prefix = None
+
+    # Configuración con la que se envía; acota el almacén que se puede elegir
+    placevendor_config_id = fields.Many2one(
+        'placevendor.config',
+        compute='_compute_placevendor_config_id'
+    )
+
+    # Almacén elegido en el asistente; se resuelve contra el catálogo local
+    # (warehouse.list) para no consultar Place Vendor al cargar las vistas
+    selected_warehouse_id = fields.Many2one(
+        'warehouse.list',
+        string='Seleccionar Almacén',
+        domain="[('config_id', '=', placevendor_config_id)]",
+        copy=False
+    )
+
+    warehouse_count = fields.Integer(
+        compute='_compute_warehouse_count'
+    )
+
+    # ============ CONEXIÓN ============
+
+    @api.depends_context('uid', 'company')
+    def _compute_placevendor_config_id(self):
+        config = self._autenticacion_placevendor()
+        for order in self:
+            order.placevendor_config_id = config
+
+    def _autenticacion_placevendor(self):
+        """Configuración autenticada del usuario y compañía actuales.
+
+        Se resuelve desde la conexión en caché, sin buscar en cada picking;
+        devuelve un recordset vacío si no hay configuración o no está
+        autenticada (ver ``_placevendor_auth_message``).
+        """
+        Config = self.env['placevendor.config']
+        connection = Config._get_connection(self.env.user.id, self.env.company.id)
+        if not connection or not connection.is_authenticated:
+            return Config
+        return Config.browse(connection.config_id)
+
+    def _placevendor_auth_message(self):
+        """Motivo por el que no hay configuración utilizable"""
+        connection = self.env['placevendor.config']._get_connection(self.env.user.id, self.env.company.id)
+        if not connection:
+            return "No hay configuración de Place Vendor para este usuario"
+        return "No estás autenticado en Place Vendor"
+
+    def _notify(self, title, message):
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': title,
+                'message': message,
+                'sticky': False,
+                'type': 'success' if 'Éxito' in title or 'success' in title.lower() else 'warning'
+            }
+        }
+
+    # ============ ALMACENES ============
+
+    @api.depends_context('uid', 'company')
+    def _compute_warehouse_count(self):
+        # Catálogo local de la configuración con la que se enviará: un único
+        # conteo para todo el recordset y nunca llamadas remotas en el compute
+        config = self._autenticacion_placevendor()
+        count = self.env['warehouse.list'].search_count([('config_id', '=', config.id)]) if config else 0
+        for order in self:
+            order.warehouse_count = count
+
+    def _placevendor_send(self, warehouse_id):
+        """Encola el envío de las órdenes al almacén ``warehouse_id`` de Place Vendor"""
+        return getattr(self, self._placevendor_send_method)(warehouse_id)
+
+    def get_warehouses_by_company(self, warehouse_name=None):
+        """Obtiene almacenes por compañía desde el catálogo local de Place Vendor"""
+        auth_config = self._autenticacion_placevendor()
+        if not auth_config:
+            return self._notify('Error', self._placevendor_auth_message())
+
+        # Solo consulta la API si la caché de almacenes expiró
+        warehouses = auth_config._get_warehouses()
+
+        if warehouse_name:
+            warehouses = warehouses.filtered(lambda wh: warehouse_name.lower() in wh.name.lower())
+
+        return warehouses
+
+    def action_open_warehouse_window(self):
+        """Abre la ventana para seleccionar almacén"""
+        self.ensure_one()
+
+        # Verificar que exista al menos un almacén disponible
+        warehouses = self.get_warehouses_by_company()
+
+        if isinstance(warehouses, dict):
+            return warehouses
+
+        if not warehouses:
+            return self._notify('Error', "No hay almacenes disponibles en Place Vendor")
+
+        # Si solo hay un almacén, usarlo directamente
+        if len(warehouses) == 1:
+            return self._placevendor_send(warehouses.external_id)
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Seleccionar Almacén',
+            'res_model': self._name,
+            'view_mode': 'form',
+            'view_id': self.env.ref(self._placevendor_warehouse_view).id,
+            'res_id': self.id,
+            'target': 'new',
+        }
+
+    def action_confirm_warehouse_selection(self):
+        """Confirmar la selección y enviar"""
+        self.ensure_one()
+
+        if not self.selected_warehouse_id:
+            return self._notify('Error', "Debe seleccionar un almacén")
+
+        warehouse_id = self.selected_warehouse_id.external_id
+        return self._placevendor_send(warehouse_id)
+
+    # ============ DOCUMENTO ============
+
+    def _placevendor_build_request(self, warehouse_id, cache, pickings=None):
+        """Documento GraphQL de la orden con sus pickings (etapa ORM).
+
+        Cada picking viaja como un campo con alias (d0, d1, ... o r0, r1,
+        ...). Devuelve un dict con ``order``, ``pickings``, ``aliases``,
+        ``fingerprints``, ``snapshots`` y ``payload``; solo incluye los
+        pickings (de ``pickings`` si se indica) que cambiaron desde el
+        último envío.
+        """
+        self.ensure_one()
+        order = self
+        pickings = order.picking_ids if pickings is None else pickings
+
+        _logger.info(f"DEBUG - Preparando {len(pickings)} picking(s) de {order.name} en una petición")
+
+        variables_list = [
+            self._placevendor_prepare_variables(picking, order, warehouse_id, cache)
+            for picking in pickings
+        ]
+        # Los pickings sin cambios desde el último envío no se vuelven a enviar
+        pickings, variables_list, fingerprints = self._placevendor_changed_pickings(pickings, variables_list)
+        # Los que ya existen en Place Vendor solo envían lo que cambió
+        calls = self._placevendor_document_calls(
+            pickings, variables_list,
+            self._placevendor_create_mutation,
+            self._placevendor_update_mutation,
+        )
+        query, variables, aliases = build_aliased_mutation(
+            self._placevendor_operation_name, calls, self._placevendor_alias_prefix,
+            selection=self._placevendor_selection()
+        )
+
+        return {
+            'order': order,
+            'pickings': pickings,
+            'aliases': aliases,
+            'fingerprints': fingerprints,
+            'snapshots': variables_list,
+            'payload': {'query': query, 'variables': variables},
+        }
+
+    def _placevendor_prepare_variables(self, picking, order, warehouse_id, cache):
+        """Variables de la mutación de alta de un picking (implementado por cada pedido)"""
+        raise NotImplementedError()
+
+    # ============ ENVÍO POR LOTES ============
+
+    def action_open_mass_send(self):
+        """Abre el asistente de envío masivo para las órdenes seleccionadas"""
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Enviar a Place Vendor',
+            'res_model': 'placevendor.mass.send',
+            'view_mode': 'form',
+            'target': 'new',
+            'context': {
+                'active_model': self._name,
+                'active_ids': self.ids,
+                'default_res_model': self._name,
+            }
+        }
+
+    def _placevendor_send_many(self, warehouse_id, concurrency=None):
+        """Envía varias órdenes: payloads en una pasada de ORM y HTTP en paralelo.
+
+        Sin ``batch_pickings`` cada picking viaja en su propio documento, que
+        también se envía en paralelo con los demás. Los resultados se guardan
+        al final, en la transacción actual. Devuelve {orden: [errores]}; una
+        lista vacía significa que se envió y ``None`` que no había cambios
+        que enviar desde el último envío.
+        """
+        results = {order: ['No hay pickings para esta orden'] for order in self if not order.picking_ids}
+        orders = self.filtered('picking_ids')
+        if not orders:
+            return results
+
+        auth_config = self._autenticacion_placevendor()
+        if not auth_config:
+            results.update({order: [self._placevendor_auth_message()] for order in orders})
+            return results
+
+        if concurrency is None:
+            concurrency = int(self.env['ir.config_parameter'].sudo().get_param(
+                'placevendor.send_concurrency', DEFAULT_SEND_CONCURRENCY))
+
+        # Etapa ORM: todos los payloads con los datos precargados en bloque
+        cache = self._placevendor_prefetch(orders, {})
+        if auth_config.batch_pickings:
+            requests_list = [order._placevendor_build_request(warehouse_id, cache) for order in orders]
+        else:
+            requests_list = [
+                order._placevendor_build_request(warehouse_id, cache, picking)
+                for order in orders
+                for picking in order.picking_ids
+            ]
+
+        # Las órdenes sin ningún picking con cambios se quedan en None
+        results.update({order: None for order in orders})
+
+        # Etapa HTTP: envío concurrente, solo de las órdenes con cambios
+        requests_list = [request for request in requests_list if request['pickings']]
+        if not requests_list:
+            # Nada cambió: ni token, ni circuito, ni limitador
+            return results
+        responses = self._placevendor_dispatch(auth_config, requests_list, concurrency)
+
+        for request, (response, error) in zip(requests_list, responses):
+            picking_results = self._placevendor_parse_response(request, response, error)
+            errors = results[request['order']] or []
+            errors += [f"{picking.name}: {error}" for picking, error in picking_results if error]
+            results[request['order']] = errors
+
+        return results
+
+    @api.model
+    def _placevendor_dispatch(self, config, requests_list, concurrency):
+        """Envía los documentos preparados en paralelo; devuelve [(respuesta, error)].
+
+        El token se resuelve antes en este hilo. Si Place Vendor lo rechaza se
+        inicia sesión de nuevo y se reenvían solo esas peticiones. Con el
+        circuito abierto no se envía nada; en prueba se envía primero un solo
+        documento y los demás solo si el servidor responde.
+        """
+        endpoint = self.env['placevendor.endpoint']
+        allowed = endpoint._allow_request(config.laravel_url)
+        if not allowed:
+            return [(None, UNAVAILABLE_MESSAGE) for request in requests_list]
+
+        payloads = [request['payload'] for request in requests_list]
+        token = config._get_token()
+        if allowed == PROBE_REQUEST:
+            responses = self._placevendor_post_limited(config, payloads[:1], token, 1)
+            response, _error = responses[0]
+            if response is None or response.status_code >= 500:
+                # Sigue caído: el resto ni se intenta
+                return responses + [(None, UNAVAILABLE_MESSAGE)] * (len(payloads) - 1)
+            if len(payloads) > 1:
+                responses += self._placevendor_post_limited(config, payloads[1:], token, concurrency)
+        else:
+            responses = self._placevendor_post_limited(config, payloads, token, concurrency)
+
+        rejected = [
+            index for index, (response, error) in enumerate(responses)
+            if response is not None and config._is_auth_error(response)
+        ]
+        if rejected:
+            retried = self._placevendor_post_limited(
+                config, [payloads[index] for index in rejected], config._login(), concurrency
+            )
+            for index, result in zip(rejected, retried):
+                responses[index] = result
+
+        return responses
+
+    @api.model
+    def _placevendor_post_limited(self, config, payloads, token, concurrency):
+        """Envío concurrente al ritmo que reserva el limitador compartido.
+
+        Los documentos que no caben en la espera máxima se devuelven como
+        error sin enviarse; los que reciben un 429 se repiten una vez.
+        """
+        endpoint = self.env['placevendor.endpoint']
+        limiter = self.env['placevendor.rate.limit']
+        url, credential = config.laravel_url, config.laravel_user
+        client = config._get_http_client()
+
+        responses = [(None, THROTTLED_MESSAGE)] * len(payloads)
+        pending = list(range(len(payloads)))
+        for _attempt in range(2):
+            delays = limiter._acquire(url, credential, len(pending))
+            sent = pending[:len(delays)]
+            results = post_concurrently(
+                client, [payloads[index] for index in sent], token, concurrency, delays=delays
+            )
+            endpoint._record_results(url, results)
+
+            pending = []
+            retry_after = None
+            for index, result in zip(sent, results):
+                responses[index] = result
+                response = result[0]
+                if response is not None and response.status_code == 429:
+                    pending.append(index)
+                    retry_after = max(retry_after or 0, parse_retry_after(response.headers.get('Retry-After')) or 0)
+
+            limiter._record_success(url, credential, len(sent) - len(pending))
+            if not pending:
+                break
+            limiter._record_throttled(url, credential, retry_after or None)
+
+        return responses
+
+    def _placevendor_parse_response(self, request, response=None, error=None):
+        """Reparte la respuesta de un documento con alias entre sus pickings"""
+        pickings = request['pickings']
+        if error:
+            return [(picking, error) for picking in pickings]
+
+        _logger.info(f"DEBUG - Response Status: {response.status_code}")
+        if response.status_code != 200:
+            error = f'Error HTTP: {response.status_code} - {response.text[:200]}'
+            return [(picking, error) for picking in pickings]
+
+        try:
+            result = response.json()
+        except json.JSONDecodeError:
+            error = f'Respuesta no es JSON válido: {response.text[:200]}'
+            return [(picking, error) for picking in pickings]
+
+        label = self._placevendor_document_label
+        errors = split_aliased_errors(result, request['aliases'])
+        data = result.get('data') or {}
+
+        results = []
+        for picking, alias, fingerprint, snapshot in zip(
+                pickings, request['aliases'], request['fingerprints'], request['snapshots']):
+            picking_result = data.get(alias) or {}
+            if errors[alias]:
+                results.append((picking, f"{label}: {' | '.join(errors[alias])}"))
+            elif not picking_result.get('id'):
+                results.append((picking, f'{label} enviada sin ID de confirmación'))
+            else:
+                _logger.info(f"DEBUG - ✅ {label} {picking.name} enviada con ID {picking_result.get('id')}")
+                picking._placevendor_mark_sent(fingerprint, picking_result['id'], snapshot)
+                self._placevendor_store_contact_ids(request['order'], picking_result)
+                results.append((picking, None))
+
+        return results
+
+    def _placevendor_changed_pickings(self, pickings, variables_list):
+        """Descarta los pickings cuyo documento no cambió desde el último envío.
+
+        Devuelve (pickings, variables, huellas) de los que hay que enviar.
+        """
+        changed = self.env['stock.picking']
+        changed_variables = []
+        fingerprints = []
+        for picking, variables in zip(pickings, variables_list):
+            fingerprint = payload_fingerprint(variables)
+            if not picking._placevendor_needs_send(fingerprint):
+                _logger.info(f"DEBUG - {picking.name} sin cambios desde el último envío, se omite")
+                continue
+            changed |= picking
+            changed_variables.append(variables)
+            fingerprints.append(fingerprint)
+        return changed, changed_variables, fingerprints
+
+    def _placevendor_document_calls(self, pickings, variables_list, create, update):
+        """Operación de cada picking: alta completa o solo los cambios.
+
+        ``create`` y ``update`` son (mutación, argumentos). Los pickings que ya
+        existen en Place Vendor se actualizan con la diferencia respecto al
+        último documento enviado.
+        """
+        calls = []
+        for picking, variables in zip(pickings, variables_list):
+            previous = picking._placevendor_last_snapshot()
+            if previous is None:
+                calls.append((create[0], create[1], wire_variables(variables)))
+                continue
+
+            changes = diff_document(previous, variables)
+            _logger.info(f"DEBUG - {picking.name}: actualización con {', '.join(changes) or 'sin cambios'}")
+            calls.append((update[0], update[1], {
+                'id': picking.placevendor_remote_id,
+                'doc_origin': variables.get('doc_origin'),
+                'changes': changes,
+            }))
+        return calls
+
+    def _placevendor_selection(self):
+        """Campos que se piden de vuelta por cada documento creado o actualizado.
+
+        Con el parámetro ``placevendor.request_contact_ids`` también se piden
+        los IDs que Place Vendor asigna a los contactos del documento.
+        """
+        selection = 'id doc_origin status date'
+        if self.env['ir.config_parameter'].sudo().get_param('placevendor.request_contact_ids'):
+            selection += ''.join(f' {field} {{ id }}' for field in self._placevendor_contact_fields)
+        return selection
+
+    def _placevendor_contact_partners(self, order):
+        """Partner de cada argumento ContactInput de la orden"""
+        return {
+            'cliente': order.partner_id,
+            'responsable': order.user_id.partner_id,
+        }
+
+    def _placevendor_store_contact_ids(self, order, result):
+        """Guarda en los partners los IDs de contacto que devolvió Place Vendor"""
+        partners = self._placevendor_contact_partners(order)
+        for field in self._placevendor_contact_fields:
+            remote_id = (result.get(field) or {}).get('id')
+            partner = partners.get(field)
+            if remote_id and partner and partner.placevendor_contact_id != str(remote_id):
+                partner.sudo().placevendor_contact_id = str(remote_id)
+
+    # ============ CONTACTOS ============
+
+    def _get_contact_info(self, partner, contact_type='Cliente'):
+        """Contacto para GraphQL, reutilizado mientras el partner no cambie"""
+        if partner and partner._name == 'res.users':
+            partner = partner.partner_id
+        if not partner:
+            return self._prepare_contact_info(partner, contact_type)
+
+        key = (self.env.cr.dbname, 'contact', partner.id, partner.write_date)
+        return _contact_cache.get_or_set(key, lambda: self._prepare_contact_info(partner, contact_type))
+
+    def _get_partner_address(self, partner):
+        """Dirección del partner en una línea, reutilizada mientras no cambie"""
+        if not partner:
+            return ''
+
+        def build():
+            try:
+                return (partner._display_address() or '').strip().replace('\n', ', ')
+            except Exception as e:
+                _logger.warning(f"No se pudo formatear la dirección de {partner.display_name}: {str(e)}")
+                return ''
+
+        key = (self.env.cr.dbname, 'address', partner.id, partner.write_date)
+        return _contact_cache.get_or_set(key, build)
+
+    def _prepare_contact_info(self, partner, contact_type='Cliente'):
+        """Prepara información de contacto para GraphQL"""
+        if not partner:
+            return {
+                'name': f'{contact_type} no especificado',
+                'email': '',
+                'phone': '',
+                'address': '',
+                'city': '',
+                'country': '',
+                'state': '',
+                'postal_code': '',
+                'employed_occupation': ''
+            }
+
+        # Obtener dirección del partner
+        address_parts = []
+        if partner.street:
+            address_parts.append(partner.street)
+        if partner.street2:
+            address_parts.append(partner.street2)
+        address = ', '.join(address_parts) if address_parts else ''
+
+        # Obtener país, estado, ciudad
+        country_name = partner.country_id.name if partner.country_id else ''
+        state_name = partner.state_id.name if partner.state_id else ''
+        city = partner.city or ''
+
+        contact = {
+            'name': partner.name or '',
+            'email': partner.email or '',
+            'phone': partner.phone or partner.mobile or '',
+            'address': address,
+            'city': city,
+            'country': country_name,
+            'state': state_name,
+            'postal_code': partner.zip or '',
+            'employed_occupation': partner.function or ''
+        }
+
+        # Si Place Vendor ya guardó el contacto basta con su ID
+        if partner.placevendor_contact_id:
+            contact['id'] = partner.placevendor_contact_id
+        return contact
+
+    # ============ LÍNEAS DE PRODUCTO ============
+
+    def _prepare_product_line(self, order, picking=None, cache=None):
+        """Prepara la línea de productos para GraphQL.
+
+        Con ``picking`` solo se envían sus propios movimientos. ``cache`` es un
+        dict que vive lo que dura un envío: guarda los datos precargados en
+        bloque y el producto de cada línea, que se calcula una sola vez aunque
+        la orden tenga varios pickings.
+        """
+        if cache is None:
+            cache = {}
+        self._placevendor_prefetch(order, cache)
+        products_cache = cache.setdefault('products', {})
+
+        if picking is None:
+            entries = [(line, line.product_id, self._get_line_qty(line), None) for line in order.order_line]
+        else:
+            entries = [
+                (self._get_move_order_line(move), move.product_id, move.product_uom_qty, move)
+                for move in picking.move_ids
+            ]
+
+        product_line = []
+        for line, product, qty, move in entries:
+            # Prepara la línea del producto
+            line_vals = {
+                'cant': int(qty),
+                'model_id': line.id or None,  # ID de la línea en Odoo
+                'model_type': self._placevendor_line_type,
+                'description': line.name or product.name,
+                LINE_PRODUCT_KEY: product.id,
+            }
+            if move:
+                line_vals[LINE_MOVE_KEY] = move.id
+
+            # Los productos que ya existen en Place Vendor se referencian por ID
+            remote = cache['remote_products'].get(product.id)
+            if remote:
+                line_vals['product_id'] = remote[0]
+                line_vals.update(self._placevendor_mapped_line_values(line, product))
+            else:
+                key = (line.id, product.id)
+                if key not in products_cache:
+                    products_cache[key] = self._prepare_product_input(product, line, order, cache)
+                line_vals['product'] = products_cache[key]
+
+            product_line.append(line_vals)
+
+        return product_line
+
+    def _placevendor_mapped_line_values(self, line, product):
+        """Datos de la línea que viajan aparte cuando el producto ya existe en
+        Place Vendor y no se envía completo"""
+        return {}
+
+    def _placevendor_prefetch(self, orders, cache):
+        """Precarga en bloque los datos de producto de una o varias órdenes"""
+        done = cache.setdefault('orders', set())
+        orders = orders.filtered(lambda o: o.id not in done)
+        if not orders:
+            return cache
+        done.update(orders.ids)
+
+        if 'base_url' not in cache:
+            cache['base_url'] = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+
+        stock = cache.setdefault('stock', {'qty': {}, 'location': {}})
+        lookup = self._get_stock_lookup(orders)
+        stock['qty'].update(lookup['qty'])
+        stock['location'].update(lookup['location'])
+
+        products = orders.order_line.product_id
+        if 'picking_ids' in orders._fields:
+            products |= orders.picking_ids.move_ids.product_id
+        cache.setdefault('images', set()).update(self._get_products_with_image(products))
+
+        # IDs de Place Vendor solo de los productos de estas órdenes
+        remote_products = cache.setdefault('remote_products', {})
+        config = self._autenticacion_placevendor()
+        if config:
+            remote_products.update(self.env['placevendor.product.map']._get_remote_ids(config.id, products.ids))
+        return cache
+
+    @api.model
+    def _placevendor_prefetch_products(self, products, cache):
+        """Precarga en bloque el stock y las imágenes de productos sin orden (catálogo).
+
+        ``remote_products`` no se carga aquí: depende de la configuración.
+        """
+        if 'base_url' not in cache:
+            cache['base_url'] = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+
+        stock = cache.setdefault('stock', {'qty': {}, 'location': {}})
+        if products:
+            stock['qty'].update(products._compute_quantities_dict(False, False, False))
+        cache.setdefault('images', set()).update(self._get_products_with_image(products))
+        return cache
+
+    def _get_stock_lookup(self, orders):
+        """Stock de todos los productos de las órdenes con consultas agrupadas.
+
+        Devuelve ``qty`` (cantidades por producto, como qty_available) y
+        ``location`` (disponible por (producto, ubicación) en las ubicaciones
+        de stock de las órdenes).
+        """
+        products = orders.order_line.product_id
+        if 'picking_ids' in orders._fields:
+            products |= orders.picking_ids.move_ids.product_id
+        lookup = {'qty': {}, 'location': {}}
+        if not products:
+            return lookup
+
+        lookup['qty'] = products._compute_quantities_dict(False, False, False)
+
+        locations = self._get_stock_locations(orders)
+        if locations:
+            groups = self.env['stock.quant']._read_group(
+                [('product_id', 'in', products.ids), ('location_id', 'in', locations.ids)],
+                ['product_id', 'location_id'],
+                ['quantity:sum', 'reserved_quantity:sum'],
+            )
+            for product, location, quantity, reserved in groups:
+                lookup['location'][(product.id, location.id)] = quantity - reserved
+
+        return lookup
+
+    def _get_products_with_image(self, products):
+        """IDs de los productos que tienen imagen, en una sola consulta.
+
+        Solo se comprueba que exista el adjunto de la imagen (de la variante o
+        de la plantilla); el binario nunca se lee.
+        """
+        if not products:
+            return set()
+
+        attachments = self.env['ir.attachment'].sudo().search_read([
+            '|',
+            '&', '&', ('res_model', '=', 'product.product'),
+            ('res_field', '=', 'image_variant_1920'),
+            ('res_id', 'in', products.ids),
+            '&', '&', ('res_model', '=', 'product.template'),
+            ('res_field', '=', 'image_1920'),
+            ('res_id', 'in', products.product_tmpl_id.ids),
+        ], ['res_model', 'res_id'])
+
+        variant_ids = {att['res_id'] for att in attachments if att['res_model'] == 'product.product'}
+        template_ids = {att['res_id'] for att in attachments if att['res_model'] == 'product.template'}
+        return {
+            product.id for product in products
+            if product.id in variant_ids or product.product_tmpl_id.id in template_ids
+        }
+
+    def _get_product_image_url(self, product, cache):
+        """Obtiene URL de la imagen del producto desde los datos precargados"""
+        base_url = cache['base_url']
+
+        if product.id in cache['images']:
+            return f"{base_url}/web/image/product.product/{product.id}/image_1920"
+        else:
+            # Imagen por defecto o placeholder
+            return f"{base_url}/web/static/img/placeholder.png"
+
+    def _map_product_status(self, product):
+        """Mapea estado de Odoo a Place Vendor"""
+        if not product.active or not product[self._placevendor_product_ok_field]:
+            return 'DEACTIVATED'
+        # ``website_published`` solo existe con el módulo website instalado
+        template = product.product_tmpl_id
+        if 'website_published' in template._fields and template.website_published:
+            return 'PUBLIC'  # Publicado en website
+        return 'PRIVATE'  # Activo pero no publicado
+
+    def _get_company_id(self, company=None):
+        """ID de la compañía en Place Vendor (tabla de mapeo en caché)"""
+        return self.env['placevendor.company.map']._get_remote_id(company or self.company_id)
+
+    def _map_category_id(self, odoo_category):
+        """ID de la categoría en Place Vendor (tabla de mapeo en caché)"""
+        return self.env['placevendor.category.map']._get_remote_id(odoo_category)
+
+    def _get_stock_locations(self, orders):
+        """Ubicaciones en las que se consulta el stock por almacén"""
+        return self.env['stock.location']
+
+    def _prepare_product_input(self, product, line, order, cache):
+        """Datos del producto para ProductLineInput (implementado por cada pedido)"""
+        raise NotImplementedError()
+
+    def _get_move_order_line(self, move):
+        """Línea de pedido que originó el movimiento"""
+        raise NotImplementedError()
+
+    def _get_line_qty(self, line):
+        """Cantidad pedida en la línea"""
+        raise NotImplementedError()
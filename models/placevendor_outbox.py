@@ -0,0 +1,207 @@
+# models/placevendor_outbox.py
+from odoo import models, fields, api
+from datetime import timedelta
+from collections import defaultdict
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Reintentos antes de dejar el envío en error
+MAX_ATTEMPTS = 5
+# Envíos que reserva cada worker en una pasada
+DEFAULT_BATCH_SIZE = 20
+
+
+class PlaceVendorOutbox(models.Model):
+    _name = 'placevendor.outbox'
+    _description = 'Cola de envíos a Place Vendor'
+    _order = 'id desc'
+
+    name = fields.Char(string='Documento', readonly=True)
+
+    res_model = fields.Char(
+        string='Modelo',
+        required=True,
+        readonly=True
+    )
+
+    res_id = fields.Many2oneReference(
+        string='ID Documento',
+        model_field='res_model',
+        required=True,
+        readonly=True
+    )
+
+    warehouse_id = fields.Integer(
+        string='Almacén Place Vendor',
+        readonly=True
+    )
+
+    # El envío se hace con las credenciales de quien lo solicitó
+    user_id = fields.Many2one(
+        'res.users',
+        string='Solicitado por',
+        required=True,
+        readonly=True
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Compañía',
+        required=True,
+        readonly=True
+    )
+
+    # Estado
+    state = fields.Selection(
+        selection=[
+            ('pending', 'Pendiente'),
+            ('done', 'Enviado'),
+            ('unchanged', 'Sin cambios'),
+            ('error', 'Error'),
+        ],
+        string='Estado',
+        default='pending',
+        required=True,
+        index=True
+    )
+
+    attempts = fields.Integer(string='Intentos', readonly=True)
+
+    next_attempt = fields.Datetime(string='Próximo intento', readonly=True)
+
+    last_error = fields.Text(string='Último error', readonly=True)
+
+    sent_at = fields.Datetime(string='Enviado', readonly=True)
+
+    @api.model
+    def _enqueue(self, orders, warehouse_id):
+        """Encola el envío de las órdenes y despierta al dispatcher"""
+        jobs = self.create([{
+            'name': order.name,
+            'res_model': order._name,
+            'res_id': order.id,
+            'warehouse_id': warehouse_id,
+            'user_id': self.env.user.id,
+            'company_id': self.env.company.id,
+        } for order in orders])
+
+        cron = self.env.ref('integracion_placevendor_odoo.ir_cron_placevendor_outbox', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        return jobs
+
+    def action_retry(self):
+        """Volver a poner en cola los envíos con error"""
+        self.filtered(lambda job: job.state == 'error').write({
+            'state': 'pending',
+            'attempts': 0,
+            'next_attempt': False,
+        })
+
+    # ============ DISPATCHER ============
+
+    @api.model
+    def _cron_dispatch(self, batch_size=DEFAULT_BATCH_SIZE, max_batches=10):
+        """Vacía la cola por lotes; se puede ejecutar en varios workers a la vez"""
+        for _batch in range(max_batches):
+            jobs = self._lock_pending(batch_size)
+            if not jobs:
+                break
+            jobs._process()
+            # Libera los bloqueos del lote antes de reservar el siguiente
+            self.env.cr.commit()
+
+    @api.model
+    def _lock_pending(self, limit):
+        """Reserva envíos pendientes; los que ya tiene otro worker se saltan"""
+        self.env.cr.execute("""
+            SELECT id
+              FROM placevendor_outbox
+             WHERE state = 'pending'
+               AND (next_attempt IS NULL OR next_attempt <= (now() at time zone 'UTC'))
+          ORDER BY id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        """, [limit])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    def _process(self):
+        """Envía los trabajos agrupados por modelo, usuario, compañía y almacén.
+
+        Cada grupo prepara todos sus documentos en una pasada de ORM, los
+        envía en paralelo y guarda los resultados al final.
+        """
+        groups = defaultdict(lambda: self.browse())
+        for job in self:
+            groups[(job.res_model, job.user_id, job.company_id, job.warehouse_id)] |= job
+
+        for (res_model, user, company, warehouse_id), jobs in groups.items():
+            Order = self.env[res_model].with_user(user).with_company(company)
+            orders = Order.browse(list(dict.fromkeys(jobs.mapped('res_id')))).exists()
+
+            missing = jobs.filtered(lambda job: job.res_id not in orders.ids)
+            missing.write({'state': 'error', 'last_error': 'El documento ya no existe'})
+            jobs -= missing
+            if not jobs:
+                continue
+
+            # Con el circuito abierto o el límite de peticiones agotado se
+            # pospone sin gastar un intento
+            retry_at = jobs._get_retry_at(Order)
+            if retry_at:
+                jobs.write({'next_attempt': retry_at})
+                continue
+
+            try:
+                with self.env.cr.savepoint():
+                    results = orders._placevendor_send_many(warehouse_id)
+            except Exception as e:
+                _logger.exception(f"Error procesando {len(jobs)} envío(s) a Place Vendor")
+                results = {order: [str(e)] for order in orders}
+
+            for job in jobs:
+                order = Order.browse(job.res_id)
+                errors = results[order]
+                if errors is None:
+                    # Nada que enviar: no se registra un envío que no ocurrió
+                    job.write({'state': 'unchanged', 'last_error': False})
+                elif errors:
+                    job._mark_failed('\n'.join(errors))
+                else:
+                    job.write({
+                        'state': 'done',
+                        'sent_at': fields.Datetime.now(),
+                        'last_error': False,
+                    })
+                    order.message_post(body='Enviado a Place Vendor')
+
+    def _get_retry_at(self, order):
+        """Momento en que Place Vendor vuelve a aceptar envíos de las órdenes, o False si ya los acepta"""
+        config = order._autenticacion_placevendor()
+        if not config:
+            return False
+        waits = [
+            self.env['placevendor.endpoint']._retry_at(config.laravel_url),
+            self.env['placevendor.rate.limit']._blocked_until(config.laravel_url, config.laravel_user),
+        ]
+        return max([wait for wait in waits if wait], default=False)
+
+    def _mark_failed(self, error):
+        """Programa un reintento con espera creciente o deja el envío en error"""
+        self.ensure_one()
+        attempts = self.attempts + 1
+        _logger.warning(f"Envío {self.name} a Place Vendor fallido (intento {attempts}): {error}")
+
+        vals = {
+            'attempts': attempts,
+            'last_error': error,
+        }
+        if attempts >= MAX_ATTEMPTS:
+            vals['state'] = 'error'
+            self.env[self.res_model].browse(self.res_id).message_post(
+                body=f'Error enviando a Place Vendor: {error}'
+            )
+        else:
+            vals['next_attempt'] = fields.Datetime.now() + timedelta(minutes=2 ** attempts)
+        self.write(vals)
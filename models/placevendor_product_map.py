@@ -0,0 +1,88 @@
+# models/placevendor_product_map.py
+from odoo import models, fields, api
+
+
+class PlaceVendorProductMap(models.Model):
+    _name = 'placevendor.product.map'
+    _description = 'Producto Odoo ↔ Place Vendor'
+    _rec_name = 'product_id'
+    _order = 'config_id, product_id'
+
+    config_id = fields.Many2one(
+        'placevendor.config',
+        string='Configuración',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    product_id = fields.Many2one(
+        'product.product',
+        string='Producto',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    remote_id = fields.Integer(
+        string='ID Place Vendor',
+        required=True,
+        index=True
+    )
+
+    remote_parent_id = fields.Integer(string='ID padre Place Vendor')
+
+    synced_at = fields.Datetime(string='Sincronizado', readonly=True)
+
+    _sql_constraints = [
+        ('unique_config_product',
+         'UNIQUE(config_id, product_id)',
+         'El producto ya está mapeado para esta configuración'),
+    ]
+
+    @api.model
+    def _get_remote_ids(self, config_id, product_ids):
+        """{product_id: (remote_id, remote_parent_id)} de los productos indicados.
+
+        Una sola consulta por lote (página del catálogo u órdenes de un
+        envío); nunca se carga el mapeo completo de la configuración.
+        """
+        if not product_ids:
+            return {}
+        self.flush_model(['config_id', 'product_id', 'remote_id', 'remote_parent_id'])
+        self.env.cr.execute("""
+            SELECT product_id, remote_id, remote_parent_id
+              FROM placevendor_product_map
+             WHERE config_id = %s
+               AND product_id = ANY(%s)
+        """, [config_id, list(product_ids)])
+        return {
+            product_id: (remote_id, remote_parent_id or None)
+            for product_id, remote_id, remote_parent_id in self.env.cr.fetchall()
+        }
+
+    @api.model
+    def _upsert(self, config, products, remote_products):
+        """Guarda los IDs que devolvió Place Vendor para ``products`` (mismo orden)"""
+        existing = {
+            mapping.product_id.id: mapping
+            for mapping in self.search([('config_id', '=', config.id), ('product_id', 'in', products.ids)])
+        }
+
+        now = fields.Datetime.now()
+        to_create = []
+        for product, remote in zip(products, remote_products):
+            if not remote or not remote.get('id'):
+                continue
+            vals = {
+                'remote_id': int(remote['id']),
+                'remote_parent_id': int(remote.get('product_idpadre') or 0),
+            }
+            mapping = existing.get(product.id)
+            if not mapping:
+                to_create.append(dict(vals, config_id=config.id, product_id=product.id, synced_at=now))
+            elif any(mapping[key] != value for key, value in vals.items()):
+                mapping.write(dict(vals, synced_at=now))
+
+        if to_create:
+            self.create(to_create)
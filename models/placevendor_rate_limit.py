@@ -0,0 +1,206 @@
+# models/placevendor_rate_limit.py
+from odoo import models, fields, api
+import threading
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Peticiones por segundo (sobrescribibles con parámetros del sistema)
+DEFAULT_INITIAL_RATE = 5.0
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 50.0
+# Peticiones que se pueden hacer de golpe con el bucket lleno
+DEFAULT_BURST = 10
+# Espera máxima (s) que se acepta antes de dar una petición por rechazada
+DEFAULT_MAX_WAIT = 30
+# Aumento del ritmo por cada petición aceptada y reducción ante un 429
+RATE_INCREASE = 0.05
+RATE_DECREASE = 0.5
+# Espera tras un 429 sin cabecera Retry-After
+DEFAULT_RETRY_AFTER = 1
+
+THROTTLED_MESSAGE = 'Límite de peticiones de Place Vendor alcanzado, se reintentará más tarde'
+
+# Peticiones correctas aún no volcadas a la base de datos: {(url, credencial): n}
+_pending_successes = {}
+_pending_lock = threading.Lock()
+
+
+class PlaceVendorRateLimit(models.Model):
+    """Token bucket por endpoint y credencial compartido entre workers.
+
+    Cada reserva descuenta del bucket en una transacción corta con la fila
+    bloqueada; el saldo puede quedar negativo, lo que equivale a reservar
+    huecos futuros que los demás workers respetan. El ritmo sube poco a poco
+    con las peticiones aceptadas y se reduce a la mitad con cada 429.
+    """
+    _name = 'placevendor.rate.limit'
+    _description = 'Límite de peticiones a Place Vendor'
+    _rec_name = 'url'
+    _order = 'url, credential'
+
+    url = fields.Char(
+        string='Endpoint',
+        required=True,
+        readonly=True
+    )
+
+    credential = fields.Char(
+        string='Credencial',
+        required=True,
+        readonly=True
+    )
+
+    rate = fields.Float(
+        string='Peticiones por segundo',
+        readonly=True,
+        digits=(16, 2)
+    )
+
+    tokens = fields.Float(string='Saldo', readonly=True, digits=(16, 2))
+
+    updated_at = fields.Datetime(string='Actualizado', readonly=True)
+
+    blocked_until = fields.Datetime(
+        string='Bloqueado hasta',
+        readonly=True,
+        help='Fin de la espera indicada por Place Vendor en el último 429'
+    )
+
+    throttled_count = fields.Integer(string='Respuestas 429', readonly=True)
+
+    last_throttled = fields.Datetime(string='Último 429', readonly=True)
+
+    _sql_constraints = [
+        ('unique_url_credential',
+         'UNIQUE(url, credential)',
+         'Ya existe el límite de peticiones para este endpoint y credencial'),
+    ]
+
+    @api.model
+    def _get_limits(self):
+        params = self.env['ir.config_parameter'].sudo()
+        return {
+            'initial': float(params.get_param('placevendor.rate_limit_initial', DEFAULT_INITIAL_RATE)),
+            'min': float(params.get_param('placevendor.rate_limit_min', DEFAULT_MIN_RATE)),
+            'max': float(params.get_param('placevendor.rate_limit_max', DEFAULT_MAX_RATE)),
+            'burst': float(params.get_param('placevendor.rate_limit_burst', DEFAULT_BURST)),
+            'max_wait': float(params.get_param('placevendor.rate_limit_max_wait', DEFAULT_MAX_WAIT)),
+        }
+
+    @api.model
+    def _acquire(self, url, credential, count=1):
+        """Reserva hasta ``count`` peticiones.
+
+        Devuelve la espera en segundos antes de cada petición reservada; las
+        que tendrían que esperar más de ``max_wait`` no se reservan, así que
+        la lista puede ser más corta que ``count``.
+        """
+        limits = self._get_limits()
+        with _pending_lock:
+            successes = _pending_successes.pop((url, credential), 0)
+
+        with self.env.registry.cursor() as cr:
+            row = self._lock_bucket(cr, url, credential)
+            if not row:
+                cr.execute("""
+                    INSERT INTO placevendor_rate_limit
+                           (url, credential, rate, tokens, updated_at, create_date, write_date)
+                    VALUES (%s, %s, %s, %s, (now() at time zone 'UTC'),
+                            (now() at time zone 'UTC'), (now() at time zone 'UTC'))
+               ON CONFLICT (url, credential) DO NOTHING
+                """, [url, credential, limits['initial'], limits['burst']])
+                row = self._lock_bucket(cr, url, credential)
+
+            bucket_id, rate, tokens, elapsed = row
+            rate = min(limits['max'], max(limits['min'], rate + RATE_INCREASE * successes))
+            # Tras un 429 ``updated_at`` queda en el futuro y el saldo sale
+            # negativo: la espera indicada por Place Vendor se suma a la reserva
+            tokens = min(limits['burst'], tokens + rate * elapsed)
+
+            delays = []
+            for index in range(count):
+                delay = max(0.0, (index + 1 - tokens) / rate)
+                if delay > limits['max_wait']:
+                    break
+                delays.append(delay)
+
+            cr.execute("""
+                UPDATE placevendor_rate_limit
+                   SET rate = %s,
+                       tokens = %s,
+                       updated_at = (now() at time zone 'UTC')
+                 WHERE id = %s
+            """, [rate, tokens - len(delays), bucket_id])
+
+        if len(delays) < count:
+            _logger.info(f"Límite de Place Vendor: {count - len(delays)} de {count} peticiones pospuestas ({rate:.2f}/s)")
+        return delays
+
+    @api.model
+    def _lock_bucket(self, cr, url, credential):
+        cr.execute("""
+            SELECT id, rate, tokens,
+                   EXTRACT(EPOCH FROM (now() at time zone 'UTC') - updated_at)
+              FROM placevendor_rate_limit
+             WHERE url = %s AND credential = %s
+               FOR UPDATE
+        """, [url, credential])
+        row = cr.fetchone()
+        return row and (row[0], float(row[1]), float(row[2]), float(row[3]))
+
+    @api.model
+    def _record_success(self, url, credential, count=1):
+        """Anota peticiones aceptadas; se aplican en la siguiente reserva"""
+        with _pending_lock:
+            key = (url, credential)
+            _pending_successes[key] = _pending_successes.get(key, 0) + count
+
+    @api.model
+    def _record_throttled(self, url, credential, retry_after=None):
+        """Reduce el ritmo a la mitad y bloquea el bucket lo que indique Retry-After"""
+        limits = self._get_limits()
+        wait = DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+        with self.env.registry.cursor() as cr:
+            cr.execute("""
+                INSERT INTO placevendor_rate_limit AS rl
+                       (url, credential, rate, tokens, updated_at, blocked_until,
+                        throttled_count, last_throttled, create_date, write_date)
+                VALUES (%(url)s, %(credential)s, GREATEST(%(min)s, %(initial)s * %(decrease)s), 0,
+                        (now() at time zone 'UTC') + make_interval(secs => %(wait)s),
+                        (now() at time zone 'UTC') + make_interval(secs => %(wait)s),
+                        1, (now() at time zone 'UTC'),
+                        (now() at time zone 'UTC'), (now() at time zone 'UTC'))
+           ON CONFLICT (url, credential) DO UPDATE
+                   SET rate = GREATEST(%(min)s, rl.rate * %(decrease)s),
+                       tokens = 0,
+                       updated_at = GREATEST(rl.updated_at, EXCLUDED.updated_at),
+                       blocked_until = GREATEST(rl.blocked_until, EXCLUDED.blocked_until),
+                       throttled_count = rl.throttled_count + 1,
+                       last_throttled = EXCLUDED.last_throttled,
+                       write_date = EXCLUDED.write_date
+             RETURNING rate
+            """, {
+                'url': url,
+                'credential': credential,
+                'min': limits['min'],
+                'initial': limits['initial'],
+                'decrease': RATE_DECREASE,
+                'wait': wait,
+            })
+            rate = cr.fetchone()[0]
+        _logger.warning(f"Place Vendor respondió 429 para {credential}: espera {wait} s, ritmo {rate:.2f}/s")
+
+    @api.model
+    def _blocked_until(self, url, credential):
+        """Fin del bloqueo por 429 si sigue vigente, o False"""
+        with self.env.registry.cursor() as cr:
+            cr.execute("""
+                SELECT blocked_until
+                  FROM placevendor_rate_limit
+                 WHERE url = %s
+                   AND credential = %s
+                   AND blocked_until > (now() at time zone 'UTC')
+            """, [url, credential])
+            row = cr.fetchone()
+        return row[0] if row else False
@@ -0,0 +1,13 @@
+# models/res_partner.py
+from odoo import models, fields
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    placevendor_contact_id = fields.Char(
+        string='ID contacto Place Vendor',
+        readonly=True,
+        copy=False,
+        index=True
+    )
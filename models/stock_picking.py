@@ -0,0 +1,61 @@
+# models/stock_picking.py
+from odoo import models, fields
+import json
+
+
+class StockPicking(models.Model):
+    _inherit = 'stock.picking'
+
+    # Último envío a Place Vendor
+    placevendor_fingerprint = fields.Char(
+        string='Huella Place Vendor',
+        readonly=True,
+        copy=False,
+        help='Hash de las variables del último documento enviado a Place Vendor'
+    )
+
+    placevendor_remote_id = fields.Char(
+        string='ID Place Vendor',
+        readonly=True,
+        copy=False
+    )
+
+    placevendor_sent_at = fields.Datetime(
+        string='Enviado a Place Vendor',
+        readonly=True,
+        copy=False
+    )
+
+    # Variables del último documento enviado; base para enviar solo los cambios
+    placevendor_snapshot = fields.Text(
+        string='Último documento Place Vendor',
+        readonly=True,
+        copy=False
+    )
+
+    def _placevendor_needs_send(self, fingerprint):
+        """Indica si el documento cambió desde el último envío"""
+        self.ensure_one()
+        if self.env.context.get('placevendor_force_send'):
+            return True
+        return not self.placevendor_remote_id or self.placevendor_fingerprint != fingerprint
+
+    def _placevendor_last_snapshot(self):
+        """Variables del último envío, o None si el documento no existe en Place Vendor"""
+        self.ensure_one()
+        if not self.placevendor_remote_id or not self.placevendor_snapshot:
+            return None
+        try:
+            return json.loads(self.placevendor_snapshot)
+        except ValueError:
+            return None
+
+    def _placevendor_mark_sent(self, fingerprint, remote_id, variables):
+        """Guarda la huella, el ID remoto y el documento tras un envío correcto"""
+        self.ensure_one()
+        self.sudo().write({
+            'placevendor_fingerprint': fingerprint,
+            'placevendor_remote_id': str(remote_id),
+            'placevendor_sent_at': fields.Datetime.now(),
+            'placevendor_snapshot': json.dumps(variables, default=str),
+        })
@@ -0,0 +1,54 @@
+# models/warehouse_list.py
+from odoo import models, fields, api
+
+
+class WarehouseList(models.Model):
+    _name = 'warehouse.list'
+    _description = 'Almacén de Place Vendor'
+    _order = 'name'
+
+    name = fields.Char(
+        string='Nombre',
+        required=True
+    )
+
+    external_id = fields.Integer(
+        string='ID Place Vendor',
+        required=True,
+        index=True
+    )
+
+    address = fields.Char(string='Dirección')
+
+    description = fields.Text(string='Descripción')
+
+    remote_company_id = fields.Integer(string='Compañía Place Vendor')
+
+    # Relaciones
+    config_id = fields.Many2one(
+        'placevendor.config',
+        string='Configuración',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    company_id = fields.Many2one(
+        related='config_id.company_id',
+        store=True,
+        index=True
+    )
+
+    # Control
+    active = fields.Boolean(string='Activo', default=True)
+
+    _sql_constraints = [
+        ('unique_config_external',
+         'UNIQUE(config_id, external_id)',
+         'El almacén ya existe para esta configuración'),
+    ]
+
+    @api.depends('name', 'address')
+    def _compute_display_name(self):
+        for warehouse in self:
+            warehouse.display_name = f"{warehouse.name} - {warehouse.address or 'Sin dirección'}"
@@ -0,0 +1,4 @@
+# tests/__init__.py
+from . import test_benchmark
+from . import test_query_count
+from . import test_placevendor_client
@@ -0,0 +1,101 @@
+# tests/common.py
+from odoo import fields
+from odoo.tests.common import TransactionCase
+from datetime import timedelta
+
+
+class PlaceVendorCase(TransactionCase):
+    """Configuración autenticada, almacén y generadores de órdenes de prueba"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = cls.env['placevendor.config'].create({
+            'laravel_user': 'bench@placevendor.test',
+            'laravel_password': 'bench',
+            'laravel_url': 'http://127.0.0.1:9/graphql',
+            'is_authenticated': True,
+            'token': 'stub-token',
+            'token_expiration': fields.Datetime.now() + timedelta(days=1),
+            'warehouses_synced_at': fields.Datetime.now(),
+        })
+        cls.warehouse = cls.env['warehouse.list'].create({
+            'name': 'Almacén 1',
+            'external_id': 1,
+            'config_id': cls.config.id,
+        })
+
+        country = cls.env.ref('base.es', raise_if_not_found=False)
+        cls.customer = cls.env['res.partner'].create({
+            'name': 'Cliente Place Vendor',
+            'email': 'cliente@placevendor.test',
+            'phone': '+34 600 000 000',
+            'street': 'Calle Mayor 1',
+            'city': 'Madrid',
+            'zip': '28001',
+            'country_id': country.id if country else False,
+        })
+        cls.vendor = cls.env['res.partner'].create({
+            'name': 'Proveedor Place Vendor',
+            'email': 'proveedor@placevendor.test',
+            'street': 'Calle Menor 2',
+            'city': 'Sevilla',
+        })
+        cls.category = cls.env['product.category'].create({'name': 'Place Vendor'})
+
+    @classmethod
+    def _create_products(cls, count):
+        return cls.env['product.product'].create([{
+            'name': f'Producto {index}',
+            'default_code': f'PV-{index:05d}',
+            'type': 'consu',
+            'is_storable': True,
+            'categ_id': cls.category.id,
+            'list_price': 10.0 + index,
+            'standard_price': 5.0,
+        } for index in range(count)])
+
+    @classmethod
+    def _create_sale_orders(cls, count, lines, pickings=1):
+        """``count`` pedidos de venta confirmados con ``lines`` líneas y ``pickings`` entregas"""
+        products = cls._create_products(lines)
+        orders = cls.env['sale.order'].create([{
+            'partner_id': cls.customer.id,
+            'order_line': [(0, 0, {'product_id': product.id, 'product_uom_qty': 2}) for product in products],
+        } for _index in range(count)])
+        orders.action_confirm()
+        cls._split_pickings(orders, pickings)
+        return orders
+
+    @classmethod
+    def _create_purchase_orders(cls, count, lines, pickings=1):
+        """``count`` pedidos de compra confirmados con ``lines`` líneas y ``pickings`` recepciones"""
+        products = cls._create_products(lines)
+        orders = cls.env['purchase.order'].create([{
+            'partner_id': cls.vendor.id,
+            'order_line': [(0, 0, {
+                'product_id': product.id,
+                'product_qty': 3,
+                'price_unit': 5.0,
+            }) for product in products],
+        } for _index in range(count)])
+        orders.button_confirm()
+        cls._split_pickings(orders, pickings)
+        return orders
+
+    @classmethod
+    def _split_pickings(cls, orders, pickings):
+        """Añade copias del primer picking hasta tener ``pickings`` por orden"""
+        for order in orders:
+            for _index in range(pickings - len(order.picking_ids)):
+                order.picking_ids[:1].copy()
+
+    @staticmethod
+    def _reset_sent(orders):
+        """Olvida los envíos anteriores para que los pickings se vuelvan a crear"""
+        orders.picking_ids.write({
+            'placevendor_fingerprint': False,
+            'placevendor_remote_id': False,
+            'placevendor_sent_at': False,
+            'placevendor_snapshot': False,
+        })
@@ -0,0 +1,146 @@
+# tests/placevendor_stub.py
+"""Servidor GraphQL local que imita a Place Vendor para los benchmarks.
+
+Responde al login, a la consulta paginada de almacenes, al catálogo de
+productos y a cualquier documento con alias (entregas y recepciones). La
+latencia, la tasa de errores 5xx y la de respuestas 429 son configurables.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Campo con alias de un documento: ``d0: createDeliveryFromOdoo(``
+ALIAS_RE = re.compile(r'(\w+)\s*:\s*(\w+)\s*\(')
+
+
+class StubPlaceVendorServer:
+    """Endpoint GraphQL falso en ``127.0.0.1`` con un puerto libre"""
+
+    def __init__(self, latency=0.0, error_rate=0.0, throttle_rate=0.0, warehouses=3, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.warehouses = warehouses
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.counts = {}
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/graphql'
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status, headers, payload = stub.handle(json.loads(body or b'{}'))
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts = {}
+
+    # ============ RESPUESTAS ============
+
+    def handle(self, request):
+        """Devuelve (estado HTTP, cabeceras, cuerpo) para un documento GraphQL"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return self._count(429, {'Retry-After': '0'}, {'message': 'Too Many Requests'})
+        if roll < self.throttle_rate + self.error_rate:
+            return self._count(503, {}, {'message': 'Service Unavailable'})
+
+        query = request.get('query') or ''
+        variables = request.get('variables') or {}
+        if 'login(' in query:
+            data = {'login': 'stub-token'}
+        elif 'getWarehousesByCompany' in query:
+            data = {'warehouses': self._warehouses_page(variables)}
+        elif 'syncProductsFromOdoo' in query:
+            data = {'products': [
+                {'id': str(self._new_id()), 'sku': product.get('sku'), 'product_idpadre': None}
+                for product in variables.get('products') or []
+            ]}
+        else:
+            data = {
+                alias: {
+                    'id': str(self._new_id()),
+                    'doc_origin': variables.get(f'{alias}_doc_origin'),
+                    'status': 'PENDING',
+                    'date': variables.get(f'{alias}_date'),
+                }
+                for alias, _mutation in ALIAS_RE.findall(query.split('{', 1)[-1])
+            }
+        return self._count(200, {}, {'data': data})
+
+    def _warehouses_page(self, variables):
+        per_page = variables.get('first') or 50
+        page = variables.get('page') or 1
+        last_page = max(1, -(-self.warehouses // per_page))
+        start = (page - 1) * per_page
+        return {
+            'data': [
+                {
+                    'id': str(index + 1),
+                    'name': f'Almacén {index + 1}',
+                    'address': f'Dirección {index + 1}',
+                    'description': False,
+                    'company_id': 1,
+                }
+                for index in range(start, min(start + per_page, self.warehouses))
+            ],
+            'paginatorInfo': {
+                'total': self.warehouses,
+                'perPage': per_page,
+                'currentPage': page,
+                'lastPage': last_page,
+                'hasMorePages': page < last_page,
+            },
+        }
+
+    def _new_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def _count(self, status, headers, payload):
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+        return status, headers, payload
@@ -0,0 +1,213 @@
+# tests/test_benchmark.py
+"""Benchmark del envío a Place Vendor contra un servidor GraphQL local.
+
+No forma parte de la batería estándar; se lanza con::
+
+    odoo-bin -d <bd> -i integracion_placevendor_odoo --test-tags placevendor_bench
+
+El tamaño y el comportamiento del servidor se ajustan con variables de
+entorno (``PLACEVENDOR_BENCH_ORDERS``, ``_LINES``, ``_PICKINGS``,
+``_ROUNDS``, ``_LATENCY``, ``_ERROR_RATE``, ``_THROTTLE_RATE``). Con
+``PLACEVENDOR_BENCH_OUTPUT`` los resultados se guardan en JSON para
+compararlos con una ejecución anterior.
+"""
+import json
+import logging
+import os
+import time
+
+from odoo.tests import tagged
+
+from .common import PlaceVendorCase
+from .placevendor_stub import StubPlaceVendorServer
+
+_logger = logging.getLogger(__name__)
+
+
+def _env_number(name, default, cast=int):
+    return cast(os.environ.get(f'PLACEVENDOR_BENCH_{name}', default))
+
+
+def percentile(values, percent):
+    """Percentil por rango más cercano de una lista no vacía"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, -(-len(ordered) * percent // 100) - 1))
+    return ordered[int(index)]
+
+
+@tagged('-standard', 'placevendor_bench', 'post_install', '-at_install')
+class TestPlaceVendorBenchmark(PlaceVendorCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.orders_count = _env_number('ORDERS', 20)
+        cls.lines_count = _env_number('LINES', 10)
+        cls.pickings_count = _env_number('PICKINGS', 1)
+        cls.rounds = _env_number('ROUNDS', 5)
+
+        cls.stub = StubPlaceVendorServer(
+            latency=_env_number('LATENCY', 0.02, float),
+            error_rate=_env_number('ERROR_RATE', 0.0, float),
+            throttle_rate=_env_number('THROTTLE_RATE', 0.0, float),
+        ).start()
+        cls.addClassCleanup(cls.stub.stop)
+        cls.config.laravel_url = cls.stub.url
+
+        # El circuito y el limitador no deben frenar el benchmark por sí mismos
+        params = cls.env['ir.config_parameter'].sudo()
+        params.set_param('placevendor.circuit_failure_threshold', '1000000')
+        for name in ('initial', 'max', 'burst'):
+            params.set_param(f'placevendor.rate_limit_{name}', '100000')
+
+        cls.sale_orders = cls._create_sale_orders(cls.orders_count, cls.lines_count, cls.pickings_count)
+        cls.purchase_orders = cls._create_purchase_orders(cls.orders_count, cls.lines_count, cls.pickings_count)
+        cls.results = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._report()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        # Los cursores propios del circuito y el limitador comparten la transacción del test
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    # ============ MEDICIÓN ============
+
+    def _measure(self, name, operation, operations=1, setup=None):
+        """Ejecuta ``operation`` ``rounds`` veces y anota tiempos y consultas"""
+        timings = []
+        queries = []
+        self.stub.reset_counts()
+        for _round in range(self.rounds):
+            if setup:
+                setup()
+            self.env.flush_all()
+            self.env.invalidate_all()
+            start_queries = self.cr.sql_log_count
+            start = time.perf_counter()
+            operation()
+            self.env.flush_all()
+            timings.append(time.perf_counter() - start)
+            queries.append(self.cr.sql_log_count - start_queries)
+
+        self.results[name] = {
+            'operations': operations,
+            'rounds': self.rounds,
+            'ops_per_second': operations * len(timings) / sum(timings),
+            'p50_ms': percentile(timings, 50) * 1000,
+            'p95_ms': percentile(timings, 95) * 1000,
+            'p99_ms': percentile(timings, 99) * 1000,
+            'queries_per_round': sum(queries) / len(queries),
+            'http': dict(self.stub.counts),
+        }
+        return self.results[name]
+
+    @classmethod
+    def _report(cls):
+        if not cls.results:
+            return
+        header = (f"Benchmark Place Vendor: {cls.orders_count} órdenes × {cls.lines_count} líneas × "
+                  f"{cls.pickings_count} pickings, {cls.rounds} rondas, latencia {cls.stub.latency * 1000:.0f} ms, "
+                  f"errores {cls.stub.error_rate:.0%}, 429 {cls.stub.throttle_rate:.0%}")
+        lines = [header, f"{'operación':<40} {'ops/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'SQL':>8}"]
+        for name, result in cls.results.items():
+            lines.append(
+                f"{name:<40} {result['ops_per_second']:>10.1f} {result['p50_ms']:>10.1f} "
+                f"{result['p95_ms']:>10.1f} {result['p99_ms']:>10.1f} {result['queries_per_round']:>8.0f}"
+            )
+        _logger.info('\n'.join(lines))
+
+        output = os.environ.get('PLACEVENDOR_BENCH_OUTPUT')
+        if output:
+            with open(output, 'w', encoding='utf-8') as report:
+                json.dump({
+                    'orders': cls.orders_count,
+                    'lines': cls.lines_count,
+                    'pickings': cls.pickings_count,
+                    'latency': cls.stub.latency,
+                    'error_rate': cls.stub.error_rate,
+                    'throttle_rate': cls.stub.throttle_rate,
+                    'results': cls.results,
+                }, report, indent=2)
+
+    def _dispatch(self, orders):
+        """Procesa los envíos pendientes de ``orders`` como lo haría el cron"""
+        jobs = self.env['placevendor.outbox'].search([
+            ('res_model', '=', orders._name),
+            ('res_id', 'in', orders.ids),
+            ('state', '=', 'pending'),
+        ])
+        jobs._process()
+        return jobs
+
+    def _assert_dispatched(self, orders, result):
+        """El envío llegó al servidor y ningún trabajo quedó con error"""
+        self.assertTrue(result['http'].get(200), "El servidor de pruebas no respondió ninguna petición")
+        if self.stub.error_rate or self.stub.throttle_rate:
+            return
+        failed = self.env['placevendor.outbox'].search([
+            ('res_model', '=', orders._name),
+            ('res_id', 'in', orders.ids),
+            ('last_error', '!=', False),
+        ])
+        self.assertFalse(failed, f"Envíos con error: {failed.mapped('last_error')}")
+
+    # ============ BENCHMARKS ============
+
+    def test_send_delivery_to_laravel(self):
+        orders = self.sale_orders
+        self._measure(
+            'send_delivery_to_laravel (encolar)',
+            lambda: orders.send_delivery_to_laravel(self.warehouse.external_id),
+            len(orders),
+        )
+        self.env['placevendor.outbox'].search([('res_model', '=', 'sale.order')]).unlink()
+
+        def send():
+            orders.send_delivery_to_laravel(self.warehouse.external_id)
+            self._dispatch(orders)
+
+        result = self._measure('send_delivery_to_laravel + envío', send, len(orders),
+                               setup=lambda: self._reset_sent(orders))
+        self._assert_dispatched(orders, result)
+
+    def test_send_reception_to_laravel(self):
+        orders = self.purchase_orders
+        self._measure(
+            'send_reception_to_laravel (encolar)',
+            lambda: orders.send_reception_to_laravel(self.warehouse.external_id),
+            len(orders),
+        )
+        self.env['placevendor.outbox'].search([('res_model', '=', 'purchase.order')]).unlink()
+
+        def send():
+            orders.send_reception_to_laravel(self.warehouse.external_id)
+            self._dispatch(orders)
+
+        result = self._measure('send_reception_to_laravel + envío', send, len(orders),
+                               setup=lambda: self._reset_sent(orders))
+        self._assert_dispatched(orders, result)
+
+    def test_get_warehouses_by_company(self):
+        order = self.sale_orders[:1]
+        self._measure('get_warehouses_by_company (caché)', order.get_warehouses_by_company)
+        self._measure(
+            'get_warehouses_by_company (Place Vendor)',
+            order.get_warehouses_by_company,
+            setup=lambda: self.config.write({'warehouses_synced_at': False}),
+        )
+        self.assertEqual(len(self.config.warehouse_ids), self.stub.warehouses)
+
+    def test_prepare_product_line(self):
+        for orders in (self.sale_orders, self.purchase_orders):
+            def prepare(orders=orders):
+                cache = {}
+                for order in orders:
+                    for picking in order.picking_ids:
+                        orders._prepare_product_line(order, picking, cache)
+
+            self._measure(f'{orders._name}._prepare_product_line', prepare, len(orders))
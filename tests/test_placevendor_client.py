@@ -0,0 +1,141 @@
+# tests/test_placevendor_client.py
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase
+
+from ..models.placevendor_client import (
+    diff_document, split_aliased_errors, parse_retry_after, payload_fingerprint,
+    LINE_PRODUCT_KEY, LINE_MOVE_KEY,
+)
+
+
+def _line(model_id, product_id, cant, move_id=None, **values):
+    line = dict({
+        'cant': cant,
+        'model_id': model_id,
+        'model_type': 'sale_order_line',
+        'description': f'Producto {product_id}',
+        LINE_PRODUCT_KEY: product_id,
+        'product': {'sku': f'PV-{product_id}', 'name': f'Producto {product_id}'},
+    }, **values)
+    if move_id:
+        line[LINE_MOVE_KEY] = move_id
+    return line
+
+
+def _document(*lines, **fields):
+    return dict({'doc_origin': 'WH/OUT/00001', 'memo': '', 'product_line': list(lines)}, **fields)
+
+
+@tagged('post_install', '-at_install')
+class TestPlaceVendorClient(BaseCase):
+    """Funciones puras del cliente: huella, diferencias, errores y Retry-After"""
+
+    # ============ HUELLA ============
+
+    def test_fingerprint_ignores_key_order(self):
+        self.assertEqual(
+            payload_fingerprint({'a': 1, 'b': {'c': 2, 'd': 3}}),
+            payload_fingerprint({'b': {'d': 3, 'c': 2}, 'a': 1}),
+        )
+
+    def test_fingerprint_ignores_credentials(self):
+        self.assertEqual(
+            payload_fingerprint({'doc_origin': 'X', 'token': 'uno', 'password': 'a'}),
+            payload_fingerprint({'doc_origin': 'X', 'token': 'dos'}),
+        )
+
+    def test_fingerprint_changes_with_content(self):
+        self.assertNotEqual(
+            payload_fingerprint(_document(_line(1, 10, 2))),
+            payload_fingerprint(_document(_line(1, 10, 3))),
+        )
+
+    # ============ DIFERENCIAS ============
+
+    def test_diff_unchanged_document_is_empty(self):
+        document = _document(_line(1, 10, 2, move_id=100))
+        self.assertEqual(diff_document(document, document), {})
+
+    def test_diff_header_fields(self):
+        changes = diff_document(_document(), _document(memo='Nueva nota'))
+        self.assertEqual(changes, {'fields': {'memo': 'Nueva nota'}})
+
+    def test_diff_lines(self):
+        previous = _document(_line(1, 10, 2, move_id=100), _line(2, 20, 1, move_id=200))
+        current = _document(_line(1, 10, 5, move_id=100), _line(3, 30, 4, move_id=300))
+
+        changes = diff_document(previous, current)
+
+        self.assertEqual(changes['modified_lines'], [{'model_id': 1, 'sku': 'PV-10', 'cant': 5}])
+        self.assertEqual(changes['removed_lines'], [{'model_id': 2, 'sku': 'PV-20'}])
+        self.assertEqual([line['model_id'] for line in changes['added_lines']], [3])
+        self.assertNotIn('fields', changes)
+
+    def test_diff_keeps_split_moves_apart(self):
+        """Dos movimientos de la misma línea y producto no se pisan"""
+        previous = _document(_line(1, 10, 2, move_id=100))
+        current = _document(_line(1, 10, 2, move_id=100), _line(1, 10, 3, move_id=101))
+
+        changes = diff_document(previous, current)
+        self.assertEqual([line['cant'] for line in changes['added_lines']], [3])
+        self.assertNotIn('modified_lines', changes)
+
+        changes = diff_document(current, previous)
+        self.assertEqual(changes['removed_lines'], [{'model_id': 1, 'sku': 'PV-10'}])
+
+    def test_diff_without_move_in_previous_snapshot(self):
+        """Las instantáneas antiguas se comparan por línea y producto"""
+        previous = _document(_line(1, 10, 2))
+        current = _document(_line(1, 10, 2, move_id=100))
+        self.assertEqual(diff_document(previous, current), {})
+
+    def test_diff_never_sends_snapshot_keys(self):
+        previous = _document(_line(1, 10, 2, move_id=100))
+        current = _document(_line(1, 10, 4, move_id=100), _line(2, 20, 1, move_id=200))
+
+        changes = diff_document(previous, current)
+        for line in changes['added_lines'] + changes['modified_lines']:
+            self.assertNotIn(LINE_PRODUCT_KEY, line)
+            self.assertNotIn(LINE_MOVE_KEY, line)
+
+    # ============ ERRORES CON ALIAS ============
+
+    def test_split_errors_by_alias(self):
+        result = {'errors': [
+            {'message': 'Producto inválido', 'path': ['d1', 'product_line']},
+            {'message': 'Datos inválidos', 'path': ['d0'], 'validation': {'date': ['Requerido']}},
+        ]}
+        self.assertEqual(split_aliased_errors(result, ['d0', 'd1']), {
+            'd0': ['Datos inválidos | Validación date: Requerido'],
+            'd1': ['Producto inválido'],
+        })
+
+    def test_split_errors_without_path_affect_all(self):
+        result = {'errors': [{'message': 'No autenticado'}]}
+        self.assertEqual(
+            split_aliased_errors(result, ['r0', 'r1']),
+            {'r0': ['No autenticado'], 'r1': ['No autenticado']},
+        )
+
+    def test_split_errors_without_errors(self):
+        self.assertEqual(split_aliased_errors({'data': {}}, ['d0']), {'d0': []})
+
+    # ============ RETRY-AFTER ============
+
+    def test_retry_after_seconds(self):
+        self.assertEqual(parse_retry_after('5'), 5.0)
+        self.assertEqual(parse_retry_after('-3'), 0.0)
+
+    def test_retry_after_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+        self.assertAlmostEqual(parse_retry_after(format_datetime(retry_at, usegmt=True)), 120, delta=5)
+        past = datetime.now(timezone.utc) - timedelta(seconds=120)
+        self.assertEqual(parse_retry_after(format_datetime(past, usegmt=True)), 0.0)
+
+    def test_retry_after_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after(''))
+        self.assertIsNone(parse_retry_after('pronto'))
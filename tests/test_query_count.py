@@ -0,0 +1,110 @@
+# tests/test_query_count.py
+import json
+
+from odoo.tests import tagged
+
+from .common import PlaceVendorCase
+from ..models.placevendor_order_mixin import _contact_cache
+
+# Tamaños de orden (líneas) que se comparan
+LINE_COUNTS = (1, 10, 100, 1000)
+# Consultas de más que se toleran respecto a la orden de una línea (lotes de
+# prefetch, stock por ubicación...); una consulta por línea las supera enseguida
+QUERY_TOLERANCE = 10
+# PNG de 1x1 píxel para el producto con imagen
+PIXEL_PNG = b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=='
+
+
+@tagged('post_install', '-at_install')
+class TestPlaceVendorQueryCount(PlaceVendorCase):
+    """El número de consultas al preparar un documento no crece con las líneas"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sale_orders = {lines: cls._create_sale_orders(1, lines) for lines in LINE_COUNTS}
+        cls.purchase_orders = {lines: cls._create_purchase_orders(1, lines) for lines in LINE_COUNTS}
+
+    def _count_queries(self, operation):
+        """Consultas de ``operation`` con la caché del ORM y de contactos vacías.
+
+        Se ejecuta una vez antes para llenar las cachés de proceso (mapeos,
+        conexión), que no dependen del tamaño de la orden.
+        """
+        operation()
+        self.env.flush_all()
+        self.env.invalidate_all()
+        _contact_cache.clear()
+
+        start = self.cr.sql_log_count
+        operation()
+        self.env.flush_all()
+        return self.cr.sql_log_count - start
+
+    def _assert_near_constant(self, orders_by_size, operation):
+        counts = {
+            lines: self._count_queries(lambda order=order: operation(order))
+            for lines, order in orders_by_size.items()
+        }
+        for lines, count in counts.items():
+            self.assertLessEqual(
+                count, counts[1] + QUERY_TOLERANCE,
+                f"Consultas por tamaño de orden {counts}: "
+                f"la orden de {lines} líneas hace {count} (¿consulta por línea?)"
+            )
+        return counts
+
+    def test_delivery_payload(self):
+        self._assert_near_constant(
+            self.sale_orders,
+            lambda order: order._placevendor_build_request(self.warehouse.external_id, {}),
+        )
+
+    def test_reception_payload(self):
+        self._assert_near_constant(
+            self.purchase_orders,
+            lambda order: order._placevendor_build_request(self.warehouse.external_id, {}),
+        )
+
+    def test_sale_product_line(self):
+        self._assert_near_constant(
+            self.sale_orders,
+            lambda order: order._prepare_product_line(order, order.picking_ids, {}),
+        )
+
+    def test_purchase_product_line(self):
+        self._assert_near_constant(
+            self.purchase_orders,
+            lambda order: order._prepare_product_line(order, order.picking_ids, {}),
+        )
+
+    def test_payload_content(self):
+        """Cada línea de la orden llega al documento, con stock e imagen precargados"""
+        order = self.sale_orders[100]
+        with_image = order.order_line[0].product_id
+        with_image.image_1920 = PIXEL_PNG
+
+        request = order._placevendor_build_request(self.warehouse.external_id, {})
+        lines = request['snapshots'][0]['product_line']
+        self.assertEqual(len(lines), 100)
+        self.assertEqual({line['model_id'] for line in lines}, set(order.order_line.ids))
+
+        # Solo el producto con imagen la enlaza; el resto lleva el placeholder
+        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+        images = {line['odoo_product_id']: line['product']['image'] for line in lines}
+        self.assertEqual(images.pop(with_image.id), f"{base_url}/web/image/product.product/{with_image.id}/image_1920")
+        self.assertEqual(set(images.values()), {f"{base_url}/web/static/img/placeholder.png"})
+
+        # El producto y el movimiento de Odoo solo identifican la línea en la instantánea
+        self.assertEqual({line['odoo_product_id'] for line in lines}, set(order.order_line.product_id.ids))
+        self.assertEqual({line['odoo_move_id'] for line in lines}, set(order.picking_ids.move_ids.ids))
+        self.assertNotIn('odoo_product_id', json.dumps(request['payload']))
+        self.assertNotIn('odoo_move_id', json.dumps(request['payload']))
+
+    def test_reception_payload_content(self):
+        """Las recepciones se preparan sin el módulo website (estado PRIVATE)"""
+        order = self.purchase_orders[10]
+        request = order._placevendor_build_request(self.warehouse.external_id, {})
+        lines = request['snapshots'][0]['product_line']
+        self.assertEqual(len(lines), 10)
+        self.assertEqual({line['product']['status'] for line in lines}, {'PRIVATE'})